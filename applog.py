@@ -0,0 +1,166 @@
+# Structured logging for the application runner
+# Leveled console output plus a buffered JSON-lines trace per application
+
+import json
+import logging
+import logging.handlers
+import os
+import re
+import time
+from urllib.parse import urlparse
+
+SUCCESS = 25
+logging.addLevelName(SUCCESS, "SUCCESS")
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Chatty third-party loggers that would flood a DEBUG trace
+_QUIET_LOGGERS = ["selenium", "urllib3", "WDM", "webdriver_manager"]
+
+
+class LazyTexts:
+    """Defers reading ``.text`` of WebElements until a log line is actually formatted.
+
+    Each ``.text`` is a WebDriver round trip, so option lists passed to a
+    suppressed log call must never be touched.
+    """
+
+    def __init__(self, elements):
+        self.elements = elements
+
+    def __str__(self):
+        texts = []
+        for element in self.elements:
+            try:
+                texts.append(element.text)
+            except Exception:
+                texts.append("<stale>")
+        return str(texts)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record with level, message and any ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class _ApplicationFilter(logging.Filter):
+    """Tags every record with the URL of the application being processed."""
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+
+    def filter(self, record):
+        record.url = self.url
+        return True
+
+
+class _FormattingMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that formats each message when it is buffered, not when it is flushed.
+
+    By flush time the page has moved on or the driver is gone, so ``LazyTexts``
+    arguments would only read stale elements.
+    """
+
+    def emit(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        super().emit(record)
+
+
+class ApplicationLogSink:
+    """Buffers records in memory and writes them to one JSON-lines file per application.
+
+    The buffer is flushed every ``capacity`` records, on any ERROR, and when the
+    application ends, so a run does one small burst of disk writes per posting.
+    """
+
+    def __init__(self, log_dir, level=logging.DEBUG, capacity=500):
+        self.log_dir = log_dir
+        self.level = level
+        self.capacity = capacity
+        self.handler = None
+        self.path = None
+        os.makedirs(log_dir, exist_ok=True)
+
+    def begin(self, url):
+        self.end()
+        host = re.sub(r"[^A-Za-z0-9.-]+", "_", urlparse(url).netloc or "local")
+        self.path = os.path.join(self.log_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{host}.jsonl")
+
+        target = logging.FileHandler(self.path, encoding="utf-8", delay=True)
+        target.setFormatter(JsonLinesFormatter())
+        self.handler = _FormattingMemoryHandler(self.capacity, flushLevel=logging.ERROR, target=target)
+        self.handler.setLevel(self.level)
+        self.handler.addFilter(_ApplicationFilter(url))
+        logging.getLogger().addHandler(self.handler)
+
+    def end(self):
+        if self.handler is None:
+            return
+        target = self.handler.target
+        logging.getLogger().removeHandler(self.handler)
+        self.handler.close()  # flushes the buffer
+        target.close()
+        self.handler = None
+
+
+# Active per-application sink, if trace files are enabled
+_sink = None
+
+
+def setup_logging(console_level="INFO", trace_level="INFO", log_dir=None):
+    """Configure console output and, if ``log_dir`` is set, per-application JSON-lines traces.
+
+    Records below both levels are never created, so their arguments are never
+    formatted. Set ``trace_level`` to "DEBUG" for full traces.
+    """
+    global _sink
+
+    console_level = logging.getLevelName(console_level) if isinstance(console_level, str) else console_level
+    trace_level = logging.getLevelName(trace_level) if isinstance(trace_level, str) else trace_level
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    console = logging.StreamHandler()
+    console.setLevel(console_level)
+    console.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    root.addHandler(console)
+
+    if log_dir:
+        _sink = ApplicationLogSink(log_dir, level=trace_level)
+        root.setLevel(min(console_level, trace_level))
+    else:
+        _sink = None
+        root.setLevel(console_level)
+
+    for name in _QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def begin_application(url):
+    """Start a new trace file for ``url``."""
+    if _sink is not None:
+        _sink.begin(url)
+
+
+def end_application():
+    """Flush and close the current trace file."""
+    if _sink is not None:
+        _sink.end()
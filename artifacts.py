@@ -0,0 +1,167 @@
+# Error artifact capture
+# Grabs screenshot, DOM and console logs on failure; compresses and stores them off the main thread
+
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+log = logging.getLogger(__name__)
+
+INDEX_FILE = "index.jsonl"
+
+
+class ArtifactStore:
+    """Size-capped ring of error artifacts written by a background thread.
+
+    Each capture becomes a directory under ``root`` holding ``screenshot.png``,
+    ``dom.html.gz`` and ``console.json.gz``, and a line in ``index.jsonl`` keyed
+    by URL and step. When the total size passes ``max_bytes`` the oldest
+    captures are deleted. Only one capture is kept per (URL, step) per run.
+    """
+
+    def __init__(self, root, max_bytes=200 * 1024 * 1024, queue_size=16):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.entries = deque()
+        self.total_bytes = 0
+        self._seen = set()
+        self._sequence = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+
+        os.makedirs(root, exist_ok=True)
+        self._load_index()
+
+        self._worker = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._worker.start()
+
+    def _load_index(self):
+        path = os.path.join(self.root, INDEX_FILE)
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if os.path.isdir(os.path.join(self.root, entry["id"])):
+                    self.entries.append(entry)
+                    self.total_bytes += entry.get("bytes", 0)
+
+    def capture(self, driver, url, step, error):
+        """Collect raw artifacts from the driver and queue them for writing.
+
+        Runs on the caller's thread but only does the WebDriver calls; never raises.
+        """
+        key = (url, step)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+
+        screenshot = page_source = console = None
+        try:
+            # Viewport screenshot: a full-page capture costs seconds on long forms
+            screenshot = driver.get_screenshot_as_png()
+        except Exception:
+            pass
+        try:
+            page_source = driver.page_source
+        except Exception:
+            pass
+        try:
+            console = driver.get_log("browser")
+        except Exception:
+            pass
+
+        self._sequence += 1
+        record = {
+            "id": f"{time.strftime('%Y%m%d-%H%M%S')}-{self._sequence:04d}-{step}",
+            "time": time.time(),
+            "url": url,
+            "host": urlparse(url).netloc,
+            "step": step,
+            "error": str(error)[:500],
+        }
+        try:
+            self._queue.put_nowait((record, screenshot, page_source, console))
+            return True
+        except queue.Full:
+            log.warning("Artifact queue full, dropping capture for %s (%s)", url, step)
+            return False
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                log.warning("Could not write error artifact: %s", e)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, record, screenshot, page_source, console):
+        directory = os.path.join(self.root, record["id"])
+        os.makedirs(directory, exist_ok=True)
+        files = []
+
+        if screenshot:
+            with open(os.path.join(directory, "screenshot.png"), "wb") as f:
+                f.write(screenshot)
+            files.append("screenshot.png")
+        if page_source is not None:
+            with gzip.open(os.path.join(directory, "dom.html.gz"), "wb", compresslevel=6) as f:
+                f.write(page_source.encode("utf-8", errors="replace"))
+            files.append("dom.html.gz")
+        if console is not None:
+            with gzip.open(os.path.join(directory, "console.json.gz"), "wb", compresslevel=6) as f:
+                f.write(json.dumps(console).encode("utf-8"))
+            files.append("console.json.gz")
+
+        record["files"] = files
+        record["bytes"] = sum(os.path.getsize(os.path.join(directory, name)) for name in files)
+        self.entries.append(record)
+        self.total_bytes += record["bytes"]
+
+        if self._evict():
+            self._rewrite_index()
+        else:
+            with open(os.path.join(self.root, INDEX_FILE), "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def _evict(self):
+        """Drop the oldest captures until under the size cap. Returns True if any were removed."""
+        evicted = False
+        # Always keep the newest capture, even if it alone exceeds the cap
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            oldest = self.entries.popleft()
+            self.total_bytes -= oldest.get("bytes", 0)
+            shutil.rmtree(os.path.join(self.root, oldest["id"]), ignore_errors=True)
+            evicted = True
+        return evicted
+
+    def _rewrite_index(self):
+        path = os.path.join(self.root, INDEX_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, path)
+
+    def find(self, url=None, step=None):
+        """Index entries matching the given URL and/or step, oldest first."""
+        return [e for e in list(self.entries)
+                if (url is None or e["url"] == url) and (step is None or e["step"] == step)]
+
+    def close(self, timeout=30):
+        """Flush queued captures and stop the writer thread."""
+        self._queue.put(None)
+        self._worker.join(timeout)
@@ -0,0 +1,252 @@
+# Command line entry point
+# Browser commands import selenium lazily, so report/validate/benchmark start in milliseconds
+
+import argparse
+import json
+import os
+import sys
+import time
+from urllib.parse import urlparse
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+# PERSONAL_INFO keys the fill logic reads
+REQUIRED_PERSONAL_KEYS = [
+    "first_name", "last_name", "email", "phone", "address_line1", "city", "state",
+    "zip_code", "country", "linkedin_url", "how_heard", "university_name",
+]
+
+# APPLICATION_SETTINGS keys read with [] (must exist) and their expected types
+REQUIRED_SETTINGS = {
+    "headless_mode": bool,
+    "implicit_wait_time": (int, float),
+    "pause_between_applications": (int, float),
+    "take_screenshot_on_error": bool,
+}
+
+# Keys read with .get() (optional) and their expected types
+OPTIONAL_SETTINGS = {
+    "per_host_burst": int,
+    "backoff_base_seconds": (int, float),
+    "backoff_max_seconds": (int, float),
+    "preflight_enabled": bool,
+    "preflight_workers": int,
+    "preflight_timeout": (int, float),
+    "recycle_after_applications": int,
+    "recycle_browser_rss_mb": (int, float),
+    "artifact_dir": str,
+    "artifact_max_mb": (int, float),
+    "log_level": str,
+    "trace_level": str,
+    "log_dir": (str, type(None)),
+    "plan_file": str,
+    "rank_by_fill_plans": bool,
+    "dry_run_settle_time": (int, float),
+    "journal_file": str,
+    "metrics_port": (int, type(None)),
+    "metrics_snapshot_file": (str, type(None)),
+    "metrics_snapshot_interval": (int, float),
+}
+
+
+def settings_path(key, default):
+    """Path for a file setting, resolved next to the scripts. Imports config only when called."""
+    try:
+        from config import APPLICATION_SETTINGS
+        name = APPLICATION_SETTINGS.get(key, default)
+    except Exception:
+        name = default
+    return os.path.join(BASE_DIR, name)
+
+
+def cmd_apply(args):
+    import main_improved
+    main_improved.main(dry_run_mode=False, job_urls_file=args.urls, preflight=False if args.no_preflight else None,
+                       metrics_port=args.metrics_port)
+    return 0
+
+
+def cmd_dry_run(args):
+    import main_improved
+    main_improved.main(dry_run_mode=True, job_urls_file=args.urls, preflight=False if args.no_preflight else None,
+                       metrics_port=args.metrics_port)
+    return 0
+
+
+def cmd_report(args):
+    from journal import read_entries, summarize_entries
+
+    path = args.journal or settings_path("journal_file", "journal.jsonl")
+    since = time.time() - args.since_hours * 3600 if args.since_hours else None
+    entries = [e for e in read_entries(path, since) if args.mode == "all" or e.get("mode") == args.mode]
+    summary = summarize_entries(entries)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    if not entries:
+        print(f"No journal entries in {path}")
+        return 0
+
+    hours = max((summary["last"] - summary["first"]) / 3600, 1 / 60)
+    print(f"=== Journal Report ({path}) ===")
+    print(f"Entries: {summary['total']} from {time.strftime('%Y-%m-%d %H:%M', time.localtime(summary['first']))} "
+          f"to {time.strftime('%Y-%m-%d %H:%M', time.localtime(summary['last']))}")
+    for status, count in sorted(summary["by_status"].items()):
+        print(f"  {status}: {count}")
+    print(f"Throughput: {summary['total'] / hours:.1f} URLs/hour, {summary['avg_duration']:.1f}s average")
+
+    print("\nBy host:")
+    for host, counts in sorted(summary["by_host"].items(), key=lambda item: -sum(item[1].values())):
+        print(f"  {host}: " + ", ".join(f"{status} {count}" for status, count in sorted(counts.items())))
+
+    if summary["top_reasons"]:
+        print("\nTop failure reasons:")
+        for reason, count in summary["top_reasons"]:
+            print(f"  {count:>4}  {reason}")
+    return 0
+
+
+def cmd_validate_config(args):
+    errors = []
+    warnings = []
+
+    try:
+        import config
+    except Exception as e:
+        print(f"ERROR: config.py could not be imported: {type(e).__name__}: {e}")
+        return 1
+
+    personal = getattr(config, "PERSONAL_INFO", None)
+    file_paths = getattr(config, "FILE_PATHS", None)
+    settings = getattr(config, "APPLICATION_SETTINGS", None)
+
+    for name, value in [("PERSONAL_INFO", personal), ("FILE_PATHS", file_paths), ("APPLICATION_SETTINGS", settings)]:
+        if not isinstance(value, dict):
+            errors.append(f"{name} is missing or not a dict")
+
+    if isinstance(personal, dict):
+        for key in REQUIRED_PERSONAL_KEYS:
+            if not str(personal.get(key) or "").strip():
+                errors.append(f"PERSONAL_INFO['{key}'] is missing or empty")
+
+    if isinstance(file_paths, dict):
+        resume = file_paths.get("resume_path")
+        if not resume:
+            errors.append("FILE_PATHS['resume_path'] is missing")
+        elif not os.path.exists(resume):
+            warnings.append(f"Resume not found at {resume}; uploads will be skipped")
+
+    if isinstance(settings, dict):
+        for key, expected in REQUIRED_SETTINGS.items():
+            if key not in settings:
+                errors.append(f"APPLICATION_SETTINGS['{key}'] is missing")
+            elif not isinstance(settings[key], expected):
+                errors.append(f"APPLICATION_SETTINGS['{key}'] has type {type(settings[key]).__name__}")
+        for key, expected in OPTIONAL_SETTINGS.items():
+            if key in settings and not isinstance(settings[key], expected):
+                errors.append(f"APPLICATION_SETTINGS['{key}'] has type {type(settings[key]).__name__}")
+        for key in ("log_level", "trace_level"):
+            if isinstance(settings.get(key), str) and settings[key].upper() not in LOG_LEVELS:
+                errors.append(f"APPLICATION_SETTINGS['{key}'] must be one of {', '.join(LOG_LEVELS)}")
+        unknown = set(settings) - set(REQUIRED_SETTINGS) - set(OPTIONAL_SETTINGS) - {"review_pause_time", "unknown_field_pause_time"}
+        for key in sorted(unknown):
+            warnings.append(f"APPLICATION_SETTINGS['{key}'] is not used")
+
+    urls_file = args.urls or os.path.join(BASE_DIR, "job_urls.txt")
+    if os.path.exists(urls_file):
+        with open(urls_file, "r") as f:
+            for number, line in enumerate(f, 1):
+                url = line.strip()
+                if url and urlparse(url).scheme not in ("http", "https"):
+                    errors.append(f"{os.path.basename(urls_file)} line {number}: not an http(s) URL: {url}")
+    else:
+        warnings.append(f"{urls_file} not found")
+
+    for message in warnings:
+        print(f"WARNING: {message}")
+    for message in errors:
+        print(f"ERROR: {message}")
+    if not errors:
+        print("Config OK")
+    return 1 if errors else 0
+
+
+def cmd_benchmark(args):
+    """Replay the fill-plan corpus through the matcher: speed, and fields whose match changed."""
+    from fill_plan import load_plans
+    from field_matching import match_key
+
+    path = args.plans or settings_path("plan_file", "fill_plans.jsonl")
+    fields = [field for plan in load_plans(path).values() for field in plan.get("fields", []) if "text" in field]
+    if not fields:
+        print(f"No fields with matcher input in {path}; run `cli.py dry-run` first")
+        return 1
+
+    changed = []
+    for field in fields:
+        key = match_key(field["text"], field.get("container_text", ""))
+        if key != field.get("key"):
+            changed.append((field, key))
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for field in fields:
+            match_key(field["text"], field.get("container_text", ""))
+    elapsed = time.perf_counter() - started
+    per_field_us = elapsed / (len(fields) * args.repeat) * 1e6
+
+    print(f"Matched {len(fields)} fields x {args.repeat} in {elapsed:.3f}s ({per_field_us:.1f} us/field)")
+    if changed:
+        print(f"\n{len(changed)} field(s) now match differently than when planned:")
+        for field, key in changed[:50]:
+            print(f"  {field.get('label', '')[:40]!r}: {field.get('key')} -> {key}")
+        return 1
+    print("No matcher regressions against the plan corpus")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Job application automation")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, func, help_text in [
+        ("apply", cmd_apply, "Apply to every URL (opens Chrome)"),
+        ("dry-run", cmd_dry_run, "Write fill plans without applying (opens Chrome)"),
+    ]:
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--urls", help="File with one job URL per line (default: job_urls.txt)")
+        sub.add_argument("--no-preflight", action="store_true", help="Skip the HTTP pre-flight check")
+        sub.add_argument("--metrics-port", type=int,
+                         help="Serve live metrics on http://127.0.0.1:PORT/metrics (default: APPLICATION_SETTINGS['metrics_port'])")
+        sub.set_defaults(func=func)
+
+    sub = subparsers.add_parser("report", help="Summarize the run journal")
+    sub.add_argument("--journal", help="Journal file (default: APPLICATION_SETTINGS['journal_file'])")
+    sub.add_argument("--since-hours", type=float, help="Only entries from the last N hours")
+    sub.add_argument("--mode", choices=["apply", "dry-run", "all"], default="all")
+    sub.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    sub.set_defaults(func=cmd_report)
+
+    sub = subparsers.add_parser("validate-config", help="Check config.py and job_urls.txt")
+    sub.add_argument("--urls", help="File with one job URL per line (default: job_urls.txt)")
+    sub.set_defaults(func=cmd_validate_config)
+
+    sub = subparsers.add_parser("benchmark", help="Time the field matcher against the fill-plan corpus")
+    sub.add_argument("--plans", help="Plan file (default: APPLICATION_SETTINGS['plan_file'])")
+    sub.add_argument("--repeat", type=int, default=100)
+    sub.set_defaults(func=cmd_benchmark)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
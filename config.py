@@ -39,7 +39,27 @@ APPLICATION_SETTINGS = {
     "implicit_wait_time": 10,
     "review_pause_time": 30,
     "unknown_field_pause_time": 50,
-    "pause_between_applications": 5,
-    "take_screenshot_on_error": True,
+    "pause_between_applications": 5,  # Minimum seconds between applications on the same host
+    "per_host_burst": 1,  # Applications a host may receive back to back before pacing kicks in
+    "backoff_base_seconds": 30,  # First backoff after a host fails; doubles per consecutive failure
+    "backoff_max_seconds": 600,
+    "take_screenshot_on_error": True,  # Save screenshot, DOM and console logs on errors
+    "artifact_dir": "artifacts",
+    "artifact_max_mb": 200,  # Oldest error artifacts are deleted past this size
+    "log_level": "INFO",  # Console verbosity: DEBUG, INFO, WARNING, ERROR
+    "trace_level": "INFO",  # Per-application JSON-lines trace verbosity; DEBUG for full traces
+    "log_dir": "logs",  # Where traces are written (None to disable)
+    "plan_file": "fill_plans.jsonl",  # Written by --dry-run, used to order the real run
+    "rank_by_fill_plans": True,
+    "dry_run_settle_time": 2,  # Seconds to let client-side forms render before planning
+    "journal_file": "journal.jsonl",  # One line per processed URL, read by `cli.py report`
+    "metrics_port": None,  # e.g. 9464 to serve Prometheus metrics on http://127.0.0.1:<port>/metrics
+    "metrics_snapshot_file": None,  # e.g. "metrics.json" for a JSON snapshot rewritten during the run
+    "metrics_snapshot_interval": 30,
+    "preflight_enabled": True,  # Check postings over HTTP before opening the browser
+    "preflight_workers": 8,
+    "preflight_timeout": 10,
+    "recycle_after_applications": 25,  # Restart Chrome after this many applications (0 = never)
+    "recycle_browser_rss_mb": 1500,  # Restart Chrome when its processes use more memory (needs psutil off Linux)
     
 }
\ No newline at end of file
@@ -0,0 +1,60 @@
+# Field matching rules
+# Maps the text around a form field to a PERSONAL_INFO / FILE_PATHS key; no browser needed
+
+# Keyword rules mapping field text to a PERSONAL_INFO / FILE_PATHS key, checked in order
+FIELD_KEYWORDS = [
+    ('first_name', ['first name', 'firstname', 'given name', 'fname', 'given name(s)', 'first', 'given']),
+    ('last_name', ['last name', 'lastname', 'family name', 'surname', 'lname', 'family name*', 'last', 'family', 'surname']),
+    ('email', ['email', 'e-mail', 'email address', 'e-mail address']),
+    ('phone', ['phone number', 'mobile', 'telephone', 'tel', 'phone']),
+    ('address_line1', ['address line 1', 'street address', 'address1', 'address line 1*', 'street']),
+    ('address_line2', ['address line 2', 'address2', 'address line 2*']),
+    ('city', ['city', 'town']),
+    ('state', ['state', 'province']),
+    ('zip_code', ['postal code', 'zip code', 'zipcode', 'zip', 'postal']),
+    ('linkedin_url', ['linkedin', 'linkedin profile', 'linkedin url']),
+    ('resume_path', ['resume', 'cv', 'attach resume', 'upload resume', 'resume upload']),
+    ('how_heard', ['how did you hear', 'how did you hear about us', 'source', 'referral source']),
+]
+
+# Looser rules applied to the text of the surrounding container for fields with generated IDs
+CONTAINER_KEYWORDS = [
+    ('first_name', ['first', 'given']),
+    ('last_name', ['last', 'family', 'surname']),
+    ('email', ['email', 'mail']),
+    ('phone', ['phone', 'mobile', 'tel']),
+    ('address_line1', ['address', 'street']),
+    ('city', ['city']),
+]
+
+
+def match_field_key(combined_text):
+    """Return the config key for a field described by ``combined_text``, or None."""
+    for key, words in FIELD_KEYWORDS:
+        if not any(word in combined_text for word in words):
+            continue
+        if key == 'phone' and ('code' in combined_text or 'extension' in combined_text):
+            continue
+        if key == 'city' and 'address' in combined_text:
+            continue
+        return key
+    return None
+
+
+def match_container_key(container_text):
+    """Config key inferred from the text of a field's surrounding container, or None."""
+    for key, words in CONTAINER_KEYWORDS:
+        if any(word in container_text for word in words):
+            return key
+    return None
+
+
+def match_key(combined_text, container_text=""):
+    """Config key for a field, falling back to container text for generated IDs."""
+    key = match_field_key(combined_text)
+
+    # For generic field IDs, try to infer from context
+    if not key and container_text:
+        return match_container_key(container_text)
+
+    return key
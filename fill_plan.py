@@ -0,0 +1,72 @@
+# Fill plans from dry runs
+# Stores per-posting plans and ranks the real run queue by how automatable each posting is
+
+import json
+import os
+
+
+def estimate_interventions(plan):
+    """Number of times a human is expected to step in for this posting."""
+    count = len(plan.get("required_unknown", []))
+    count += sum(1 for question in plan.get("radio_questions", []) if question["status"] != "matched")
+    count += sum(1 for field in plan.get("fields", []) if field["status"] == "missing_file")
+    if plan.get("login_wall"):
+        count += 1
+    # A custom dropdown may not offer India once opened, so it can need a hand too
+    if plan.get("country") in ("unmatched", "custom"):
+        count += 1
+    if plan.get("error"):
+        count += 1
+    return count
+
+
+def summarize(plan):
+    """Short counts for logging and reports."""
+    fields = plan.get("fields", [])
+    return {
+        "matched": sum(1 for f in fields if f["status"] == "matched"),
+        "unmatched": sum(1 for f in fields if f["status"] == "unmatched"),
+        "prefilled": sum(1 for f in fields if f["status"] == "prefilled"),
+        "required_unknown": len(plan.get("required_unknown", [])),
+        "interventions": plan.get("interventions", 0),
+    }
+
+
+def append_plan(path, plan):
+    """Append a plan to the JSON-lines plan file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(plan) + "\n")
+
+
+def load_plans(path):
+    """Latest plan per URL from the plan file (empty if it does not exist)."""
+    plans = {}
+    if not os.path.exists(path):
+        return plans
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                plan = json.loads(line)
+            except ValueError:
+                continue
+            plans[plan["url"]] = plan
+    return plans
+
+
+def plan_priority(plan):
+    """Sort key for a posting's plan (lower runs first); ``None`` for postings without a plan."""
+    if plan is None:
+        return (1, 0, 0)
+    return (0, plan.get("interventions", 0), -summarize(plan)["matched"])
+
+
+def rank_urls(urls, plans):
+    """Order URLs so postings needing the fewest interventions go first.
+
+    Ties prefer postings with more matched fields. URLs without a plan go
+    last, in their original order.
+    """
+    return sorted(urls, key=lambda url: plan_priority(plans.get(url)))
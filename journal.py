@@ -0,0 +1,66 @@
+# Run journal
+# One JSON line per processed URL, so runs can be reported on without a browser
+
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlparse
+
+
+def append_entry(path, url, mode, status, reason="", duration=0.0, **extra):
+    """Record the outcome of one URL."""
+    entry = {
+        "time": time.time(),
+        "url": url,
+        "host": urlparse(url).netloc,
+        "mode": mode,
+        "status": status,
+        "reason": reason,
+        "duration": round(duration, 2),
+    }
+    entry.update(extra)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def read_entries(path, since=None):
+    """Journal entries, oldest first, optionally only those at or after ``since`` (epoch seconds)."""
+    entries = []
+    if not os.path.exists(path):
+        return entries
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if since is None or entry.get("time", 0) >= since:
+                entries.append(entry)
+    return entries
+
+
+def summarize_entries(entries):
+    """Totals, per-host outcomes and the most common failure reasons."""
+    by_status = Counter(entry["status"] for entry in entries)
+    by_host = defaultdict(Counter)
+    reasons = Counter()
+    for entry in entries:
+        by_host[entry["host"]][entry["status"]] += 1
+        if entry["status"] != "success" and entry.get("reason"):
+            # First line only: WebDriver messages carry long stack traces
+            reasons[entry["reason"].splitlines()[0][:120]] += 1
+
+    durations = [entry.get("duration", 0) for entry in entries]
+    return {
+        "total": len(entries),
+        "by_status": dict(by_status),
+        "by_host": {host: dict(counts) for host, counts in by_host.items()},
+        "top_reasons": reasons.most_common(10),
+        "avg_duration": sum(durations) / len(durations) if durations else 0.0,
+        "first": entries[0]["time"] if entries else None,
+        "last": entries[-1]["time"] if entries else None,
+    }
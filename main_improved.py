@@ -16,7 +16,42 @@ import os
 import re
 from urllib.parse import urlparse
 import sys
+import logging
 from config import PERSONAL_INFO, FILE_PATHS, APPLICATION_SETTINGS
+from scheduler import HostScheduler, host_of
+from preflight import triage_urls, order_for_run, run_priority
+from session import SessionSupervisor, CRASH_MARKERS
+from artifacts import ArtifactStore
+from field_matching import match_field_key, match_key
+from scanner import (
+    ROOTS_PRELUDE, group_by_frame, retry_stale, run_in_frames, scan_buttons, scan_fields, switch_to_frame_path
+)
+from journal import append_entry
+from fill_plan import append_plan, estimate_interventions, load_plans, plan_priority, rank_urls, summarize
+from applog import SUCCESS, LazyTexts, setup_logging, begin_application, end_application
+from metrics import metrics
+
+log = logging.getLogger(__name__)
+
+# Error artifact store, set up in main() when take_screenshot_on_error is enabled
+artifact_store = None
+
+
+class LoginWallError(Exception):
+    """Raised when a posting requires a login that cannot be completed."""
+
+def capture_error(driver, step, error, url=None):
+    """Queue screenshot, DOM and console logs for an error; writing happens in the background."""
+    if artifact_store is None:
+        return
+    # A dead session would only add timeouts on top of the failure
+    if any(marker in str(error).lower() for marker in CRASH_MARKERS):
+        return
+    try:
+        url = url or driver.current_url
+    except Exception:
+        return
+    artifact_store.capture(driver, url, step, error)
 
 def initialize_driver(headless=False):
     """Initialize Chrome WebDriver."""
@@ -30,6 +65,8 @@ def initialize_driver(headless=False):
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option('useAutomationExtension', False)
+    # Keep console logs available for error artifacts
+    options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
     
     service = Service(ChromeDriverManager().install())
@@ -37,220 +74,155 @@ def initialize_driver(headless=False):
     driver.implicitly_wait(APPLICATION_SETTINGS["implicit_wait_time"])
     return driver
 
+def value_for_key(key):
+    """Value to fill for a config key returned by ``match_field_key``."""
+    if key is None:
+        return None
+    if key == 'resume_path':
+        return FILE_PATHS.get(key)
+    return PERSONAL_INFO.get(key)
+
+def match_field_data(combined_text):
+    """Return the value to fill for a field described by ``combined_text``, or None."""
+    return value_for_key(match_field_key(combined_text))
+
+def field_text(field):
+    """Lower-cased identifying text of a scanned field, without its label."""
+    return f"{field['id']} {field['name']} {field['placeholder']} {field['aria_label']} {field['title']}".lower()
+
+def match_scanned_key(field, combined_text):
+    """Config key for a scanned field, falling back to container text for generated IDs."""
+    return match_key(combined_text, field['container_text'])
+
+def fill_element(input_elem, data_to_fill, field_type):
+    """Type, select or upload ``data_to_fill`` into a field. Returns True if it was filled."""
+    if field_type == 'file':
+        if os.path.exists(data_to_fill):
+            input_elem.send_keys(os.path.abspath(data_to_fill))
+            log.log(SUCCESS, "Uploaded %s", data_to_fill)
+            return True
+    elif input_elem.tag_name == 'select':
+        try:
+            select = Select(input_elem)
+            # Try exact match first
+            try:
+                select.select_by_visible_text(data_to_fill)
+                log.log(SUCCESS, "Selected %s", data_to_fill)
+                return True
+            except:
+                # Try partial match
+                options = [option.text for option in select.options]
+                for option in options:
+                    if data_to_fill.lower() in option.lower() or option.lower() in data_to_fill.lower():
+                        select.select_by_visible_text(option)
+                        log.log(SUCCESS, "Selected %s (partial match for %s)", option, data_to_fill)
+                        return True
+                else:
+                    log.warning("Could not find option matching %s", data_to_fill)
+                    log.debug("Available options: %s", options)
+        except StaleElementReferenceException:
+            # Let the caller re-locate the field and retry
+            raise
+        except Exception as e:
+            log.warning("Could not select %s: %s", data_to_fill, e)
+    else:
+        input_elem.clear()
+        input_elem.send_keys(data_to_fill)
+        log.log(SUCCESS, "Filled with %s", data_to_fill)
+        return True
+    return False
+
 def find_and_fill_fields(driver):
-    """Find and fill all input fields on the page."""
-    print("INFO: Scanning for input fields...")
-    
-    # Get all input elements
-    inputs = driver.find_elements(By.XPATH, 
-        "//input[not(@type='hidden') and not(@readonly) and not(@disabled)] | "
-        "//textarea[not(@readonly) and not(@disabled)] | "
-        "//select[not(@disabled)]")
-    
-    print(f"INFO: Found {len(inputs)} input fields")
-    
+    """Find and fill all input fields on the page, its frames and shadow roots."""
     # FIRST: Handle Country field specifically (highest priority)
-    print("INFO: Prioritizing Country field...")
-    country_filled = handle_country_field_first(driver)
+    log.info("Prioritizing Country field...")
+    with metrics.stage("dropdown"):
+        country_filled = handle_country_field_first(driver)
     
     # Wait a moment for any form updates after country selection
     if country_filled:
-        print("INFO: Country selected, waiting for form to update...")
+        log.info("Country selected, waiting for form to update...")
         time.sleep(3)  # Increased wait time
-        
-        # Re-scan for input fields after form update
-        print("INFO: Re-scanning for input fields after country selection...")
-        inputs = driver.find_elements(By.XPATH, 
-            "//input[not(@type='hidden') and not(@readonly) and not(@disabled)] | "
-            "//textarea[not(@readonly) and not(@disabled)] | "
-            "//select[not(@disabled)]")
-        print(f"INFO: Found {len(inputs)} input fields after country selection")
+    
+    # Scan after the country update so fields it reveals are included
+    log.info("Scanning for input fields...")
+    with metrics.stage("scan"):
+        fields = scan_fields(driver)
+    log.info("Found %s input fields in %s frame(s)", len(fields), len({f['frame'] for f in fields}) or 1)
     
     filled_count = country_filled
+    i = -1
+    fill_started = time.perf_counter()
     
-    # THEN: Fill other fields
-    for i, input_elem in enumerate(inputs):
-        try:
-            # Check if element is still valid
+    # THEN: Fill other fields, entering each frame once
+    for frame_path, frame_fields in group_by_frame(fields):
+        if not switch_to_frame_path(driver, frame_path):
+            log.warning("Frame %s disappeared before filling", frame_path)
+            continue
+        
+        for field in frame_fields:
+            i += 1
             try:
-                if not input_elem.is_displayed():
+                if not field['visible']:
                     continue
-            except:
-                print(f"DEBUG: Element {i+1} became stale, skipping...")
-                continue
-            
-            # Get field info
-            field_type = input_elem.get_attribute('type') or 'text'
-            field_id = input_elem.get_attribute('id') or ''
-            field_name = input_elem.get_attribute('name') or ''
-            field_placeholder = input_elem.get_attribute('placeholder') or ''
-            field_aria_label = input_elem.get_attribute('aria-label') or ''
-            field_title = input_elem.get_attribute('title') or ''
-            current_value = input_elem.get_attribute('value') or ''
-            
-            # Skip if already has value
-            if current_value.strip() and field_type not in ['select-one', 'radio', 'checkbox']:
-                continue
-            
-            # Skip country field as it's already handled
-            combined_text = f"{field_id} {field_name} {field_placeholder} {field_aria_label} {field_title}".lower()
-            if any(word in combined_text for word in ['country', 'country/region']):
-                continue
-            
-            # Get label - try multiple approaches
-            label_text = ""
-            
-            # Try label for attribute
-            try:
-                if field_id:
-                    label = driver.find_element(By.XPATH, f"//label[@for='{field_id}']")
-                    label_text = label.text.strip()
-            except:
-                pass
-            
-            # Try parent label
-            if not label_text:
-                try:
-                    parent_label = input_elem.find_element(By.XPATH, "./ancestor::label[1]")
-                    label_text = parent_label.text.strip()
-                except:
-                    pass
-            
-            # Try sibling label
-            if not label_text:
-                try:
-                    sibling = input_elem.find_element(By.XPATH, "./preceding-sibling::*[1]")
-                    if sibling and sibling.text.strip():
-                        label_text = sibling.text.strip()
-                except:
-                    pass
-            
-            # Try parent div with text
-            if not label_text:
-                try:
-                    parent = input_elem.find_element(By.XPATH, "./..")
-                    if parent and parent.text.strip():
-                        parent_text = parent.text.strip()
-                        # Extract first line as label
-                        label_text = parent_text.split('\n')[0][:50]
-                except:
-                    pass
-            
-            # Combine all text for matching
-            combined_text = f"{field_id} {field_name} {field_placeholder} {field_aria_label} {field_title} {label_text}".lower()
-            
-            # Match field to data with more comprehensive matching
-            data_to_fill = None
-            
-            # More comprehensive matching patterns
-            if any(word in combined_text for word in ['first name', 'firstname', 'given name', 'fname', 'given name(s)', 'first', 'given']):
-                data_to_fill = PERSONAL_INFO.get('first_name')
-            elif any(word in combined_text for word in ['last name', 'lastname', 'family name', 'surname', 'lname', 'family name*', 'last', 'family', 'surname']):
-                data_to_fill = PERSONAL_INFO.get('last_name')
-            elif any(word in combined_text for word in ['email', 'e-mail', 'email address', 'e-mail address']):
-                data_to_fill = PERSONAL_INFO.get('email')
-            elif any(word in combined_text for word in ['phone number', 'mobile', 'telephone', 'tel', 'phone']) and 'code' not in combined_text and 'extension' not in combined_text:
-                data_to_fill = PERSONAL_INFO.get('phone')
-            elif any(word in combined_text for word in ['address line 1', 'street address', 'address1', 'address line 1*', 'street']):
-                data_to_fill = PERSONAL_INFO.get('address_line1')
-            elif any(word in combined_text for word in ['address line 2', 'address2', 'address line 2*']):
-                data_to_fill = PERSONAL_INFO.get('address_line2')
-            elif any(word in combined_text for word in ['city', 'town','City']) and 'address' not in combined_text:
-                data_to_fill = PERSONAL_INFO.get('city')
-            elif any(word in combined_text for word in ['state', 'province']):
-                data_to_fill = PERSONAL_INFO.get('state')
-            elif any(word in combined_text for word in ['postal code', 'zip code', 'zipcode', 'zip', 'postal']):
-                data_to_fill = PERSONAL_INFO.get('zip_code')
-            elif any(word in combined_text for word in ['Linkedin', 'Linkedin profile', 'Linkedin URL','linkedin']):
-                data_to_fill = PERSONAL_INFO.get('linkedin_url')
-            elif any(word in combined_text for word in ['resume', 'cv', 'attach resume', 'upload resume', 'resume upload']):
-                data_to_fill = FILE_PATHS.get('resume_path')
-            elif any(word in combined_text for word in ['how did you hear', 'how did you hear about us', 'source', 'referral source']):
-                data_to_fill = PERSONAL_INFO.get('how_heard')
-            
-            # For generic field IDs, try to infer from context
-            if not data_to_fill and field_id and len(field_id) > 20:  # Generic ID
-                # Look at surrounding context
-                try:
-                    # Get parent container text
-                    parent_container = input_elem.find_element(By.XPATH, "./ancestor::div[contains(@class, 'field') or contains(@class, 'form') or contains(@class, 'input')][1]")
-                    container_text = parent_container.text.lower()
-                    
-                    # Match based on container text
-                    if any(word in container_text for word in ['first', 'given']):
-                        data_to_fill = PERSONAL_INFO.get('first_name')
-                    elif any(word in container_text for word in ['last', 'family', 'surname']):
-                        data_to_fill = PERSONAL_INFO.get('last_name')
-                    elif any(word in container_text for word in ['email', 'mail']):
-                        data_to_fill = PERSONAL_INFO.get('email')
-                    elif any(word in container_text for word in ['phone', 'mobile', 'tel']):
-                        data_to_fill = PERSONAL_INFO.get('phone')
-                    elif any(word in container_text for word in ['address', 'street']):
-                        data_to_fill = PERSONAL_INFO.get('address_line1')
-                    elif any(word in container_text for word in ['city']):
-                        data_to_fill = PERSONAL_INFO.get('city')
-                except:
-                    pass
-            
-            if data_to_fill:
-                print(f"INFO: Filling field {i+1}: {label_text or field_name or field_id} with {data_to_fill}")
                 
-                # Fill the field with stale element handling
-                try:
-                    if field_type == 'file':
-                        if os.path.exists(data_to_fill):
-                            input_elem.send_keys(os.path.abspath(data_to_fill))
-                            print(f"SUCCESS: Uploaded {data_to_fill}")
-                            filled_count += 1
-                    elif input_elem.tag_name == 'select':
-                        try:
-                            select = Select(input_elem)
-                            # Try exact match first
-                            try:
-                                select.select_by_visible_text(data_to_fill)
-                                print(f"SUCCESS: Selected {data_to_fill}")
-                                filled_count += 1
-                            except:
-                                # Try partial match
-                                options = [option.text for option in select.options]
-                                for option in options:
-                                    if data_to_fill.lower() in option.lower() or option.lower() in data_to_fill.lower():
-                                        select.select_by_visible_text(option)
-                                        print(f"SUCCESS: Selected {option} (partial match for {data_to_fill})")
-                                        filled_count += 1
-                                        break
-                                else:
-                                    print(f"WARNING: Could not find option matching {data_to_fill}")
-                                    print(f"Available options: {options}")
-                        except Exception as e:
-                            print(f"WARNING: Could not select {data_to_fill}: {str(e)}")
-                    else:
-                        input_elem.clear()
-                        input_elem.send_keys(data_to_fill)
-                        print(f"SUCCESS: Filled with {data_to_fill}")
-                        filled_count += 1
-                except Exception as e:
-                    print(f"ERROR: Could not fill field {i+1}: {str(e)}")
+                field_type = field['type']
+                field_id = field['id']
+                field_name = field['name']
+                label_text = field['label']
+                
+                # Skip if already has value
+                if field['value'].strip() and field_type not in ['select-one', 'radio', 'checkbox']:
                     continue
-            else:
-                print(f"SKIP: Field {i+1} - {label_text or field_name or field_id} (no match)")
                 
-        except Exception as e:
-            print(f"ERROR: Could not process field {i+1}: {str(e)}")
-            continue
+                # Skip country field as it's already handled
+                combined_text = field_text(field)
+                if any(word in combined_text for word in ['country', 'country/region']):
+                    continue
+                
+                # Combine all text for matching
+                combined_text = f"{combined_text} {label_text}".lower()
+                
+                # Match field to data with more comprehensive matching
+                data_to_fill = value_for_key(match_scanned_key(field, combined_text))
+                
+                if data_to_fill:
+                    log.debug("Filling field %s: %s with %s", i+1, label_text or field_name or field_id, data_to_fill,
+                              extra={"step": "fill", "field": field_name or field_id, "frame": str(frame_path)})
+                    
+                    # Fill the field, re-locating it by signature if the page re-rendered
+                    try:
+                        if retry_stale(driver, field, lambda elem: fill_element(elem, data_to_fill, field_type)):
+                            filled_count += 1
+                    except Exception as e:
+                        log.error("Could not fill field %s: %s", i+1, e)
+                        capture_error(driver, "fill_field", e)
+                        continue
+                else:
+                    log.debug("Skipping field %s - %s (no match)", i+1, label_text or field_name or field_id)
+                    
+            except Exception as e:
+                log.error("Could not process field %s: %s", i+1, e)
+                capture_error(driver, "process_field", e)
+                continue
+    
+    driver.switch_to.default_content()
+    metrics.observe("fill", time.perf_counter() - fill_started)
     
     # Handle other custom dropdown buttons (but not country)
-    print("INFO: Checking for other custom dropdown buttons...")
-    other_dropdown_filled = handle_other_custom_dropdowns(driver)
+    log.info("Checking for other custom dropdown buttons...")
+    with metrics.stage("dropdown"):
+        other_dropdown_filled = handle_other_custom_dropdowns(driver)
     filled_count += other_dropdown_filled
     
-    print(f"INFO: Filled {filled_count} fields automatically")
+    log.info("Filled %s fields automatically", filled_count)
+    metrics.record_fields("auto", filled_count)
     return filled_count
 
 '''
 def auto_select_radio_yes_no(driver):
     """Automatically select 'No' by clicking the label."""
-    print("INFO: Checking for Yes/No radio groups...")
+    log.info("Checking for Yes/No radio groups...")
 
     radio_groups = driver.find_elements(By.XPATH, "//fieldset")
 
@@ -258,7 +230,7 @@ def auto_select_radio_yes_no(driver):
         try:
             text = group.text.lower()
             if "worked for calix" in text or "previous employee" in text or "have you worked" in text:
-                print(f"INFO: Detected Yes/No question: {text[:60]}...")
+                log.info("Detected Yes/No question: %s...", text[:60])
 
                 # Find all labels inside this group
                 labels = group.find_elements(By.XPATH, ".//label")
@@ -266,60 +238,69 @@ def auto_select_radio_yes_no(driver):
                 for label in labels:
                     if "no" in label.text.strip().lower():
                         label.click()
-                        print("SUCCESS: Selected 'No' by clicking label.")
+                        log.log(SUCCESS, "Selected 'No' by clicking label.")
                         return True
 
         except Exception as e:
-            print(f"WARNING: Could not auto-select radio: {str(e)}")
+            log.warning("Could not auto-select radio: %s", e)
             continue
 
     return False
 
 '''
+def is_yes_no_question(label_text):
+    """True for fieldset text that looks like a Yes/No question."""
+    return "have you worked" in label_text or "yes" in label_text and "no" in label_text
+
 def auto_select_radio_yes_no(driver):
-    print("INFO: Checking for Yes/No radio groups...")
+    log.info("Checking for Yes/No radio groups...")
     try:
         fieldsets = driver.find_elements(By.TAG_NAME, "fieldset")
         for fieldset in fieldsets:
             label_text = fieldset.text.strip().lower()
-            if "have you worked" in label_text or "yes" in label_text and "no" in label_text:
+            if is_yes_no_question(label_text):
                 try:
                     no_label = fieldset.find_element(By.XPATH, ".//label[contains(text(), 'No')]")
                     driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", no_label)
                     no_label.click()
-                    print("SUCCESS: Selected 'No' for Yes/No question")
+                    log.log(SUCCESS, "Selected 'No' for Yes/No question")
                 except Exception as inner_e:
-                    print(f"WARNING: Could not select 'No': {inner_e}")
+                    log.warning("Could not select 'No': %s", inner_e)
     except Exception as e:
-        print(f"WARNING: Error while scanning radio groups: {e}")
+        log.warning("Error while scanning radio groups: %s", e)
+
+
 
+# Multiple selectors for Country field
+COUNTRY_SELECTORS = [
+    "//button[contains(@aria-label, 'Country')]",
+    "//button[contains(@aria-label, 'Region')]",
+    "//button[contains(@aria-label, 'Country/Region')]",
+    "//select[contains(@name, 'country')]",
+    "//select[contains(@id, 'country')]",
+    "//input[contains(@name, 'country')]",
+    "//input[contains(@id, 'country')]",
+    "//button[@aria-haspopup='listbox'][contains(text(), 'United States')]",
+    "//button[@aria-haspopup='listbox'][contains(text(), 'America')]"
+]
 
+def is_india_option(option_text):
+    """True for India, but not British Indian Ocean Territory."""
+    text = option_text.strip().lower()
+    return text == 'india' or ('india' in text and 'british' not in text and 'territory' not in text)
 
 def handle_country_field_first(driver):
     """Handle Country field with highest priority."""
-    print("INFO: Looking for Country field specifically...")
-    
-    # Multiple selectors for Country field
-    country_selectors = [
-        "//button[contains(@aria-label, 'Country')]",
-        "//button[contains(@aria-label, 'Region')]",
-        "//button[contains(@aria-label, 'Country/Region')]",
-        "//select[contains(@name, 'country')]",
-        "//select[contains(@id, 'country')]",
-        "//input[contains(@name, 'country')]",
-        "//input[contains(@id, 'country')]",
-        "//button[@aria-haspopup='listbox'][contains(text(), 'United States')]",
-        "//button[@aria-haspopup='listbox'][contains(text(), 'America')]"
-    ]
-    
-    for selector in country_selectors:
+    log.info("Looking for Country field specifically...")
+    
+    for selector in COUNTRY_SELECTORS:
         try:
             elements = driver.find_elements(By.XPATH, selector)
             for element in elements:
                 if not element.is_displayed():
                     continue
                 
-                print(f"INFO: Found Country field: {element.text or element.get_attribute('aria-label')}")
+                log.info("Found Country field: %s", element.text or element.get_attribute('aria-label'))
                 
                 try:
                     if element.tag_name == 'button':
@@ -335,33 +316,27 @@ def handle_country_field_first(driver):
                             options = driver.find_elements(By.XPATH, 
                                 "//div[contains(@class, 'menu')]//div | //ul[contains(@class, 'menu')]//li")
                         
-                        # Find and click India with more precise matching
+                        # Find and click India (not "British Indian Ocean Territory")
                         india_found = False
                         for option in options:
                             option_text = option.text.strip()
-                            print(f"DEBUG: Checking option: '{option_text}'")
+                            log.debug("Checking option: '%s'", option_text)
                             
-                            # Exact match for "India" (not "British Indian Territory")
-                            if option_text.lower() == 'india':
-                                option.click()
-                                print(f"SUCCESS: Selected India (exact match)")
-                                india_found = True
-                                break
-                            # Check for "India" but not "British" or "Territory"
-                            elif 'india' in option_text.lower() and 'british' not in option_text.lower() and 'territory' not in option_text.lower():
+                            if is_india_option(option_text):
                                 option.click()
-                                print(f"SUCCESS: Selected {option_text} (India without British/Territory)")
+                                log.log(SUCCESS, "Selected %s", option_text)
                                 india_found = True
                                 break
                         
                         if not india_found:
-                            print(f"WARNING: Could not find exact India option in dropdown")
-                            print(f"Available options: {[opt.text for opt in options]}")
+                            log.warning("Could not find exact India option in dropdown")
+                            log.debug("Available options: %s", LazyTexts(options))
                             
                             # Ask user to select manually if no exact match
                             if not APPLICATION_SETTINGS["headless_mode"]:
-                                print("Please select India manually from the dropdown and press Enter...")
-                                input("Press Enter after selecting India...")
+                                with metrics.paused():
+                                    print("Please select India manually from the dropdown and press Enter...")
+                                    input("Press Enter after selecting India...")
                                 india_found = True
                             
                             # Close dropdown
@@ -375,298 +350,492 @@ def handle_country_field_first(driver):
                         try:
                             # Try exact match first
                             select.select_by_visible_text('India')
-                            print(f"SUCCESS: Selected India from select dropdown")
+                            log.log(SUCCESS, "Selected India from select dropdown")
                             return 1
                         except:
-                            # Try partial match but avoid British Indian Territory
+                            # Try partial match but avoid British Indian Ocean Territory
                             for option in select.options:
                                 option_text = option.text.strip()
-                                if option_text.lower() == 'india':
+                                if is_india_option(option_text):
                                     select.select_by_visible_text(option_text)
-                                    print(f"SUCCESS: Selected {option_text} (exact match)")
-                                    return 1
-                                elif 'india' in option_text.lower() and 'british' not in option_text.lower() and 'territory' not in option_text.lower():
-                                    select.select_by_visible_text(option_text)
-                                    print(f"SUCCESS: Selected {option_text} (India without British/Territory)")
+                                    log.log(SUCCESS, "Selected %s (partial match)", option_text)
                                     return 1
                     
                 except Exception as e:
-                    print(f"ERROR: Could not handle Country field: {str(e)}")
+                    log.error("Could not handle Country field: %s", e)
                     continue
                 
         except Exception as e:
-            print(f"ERROR: Could not process Country selector {selector}: {str(e)}")
+            log.error("Could not process Country selector %s: %s", selector, e)
             continue
     
-    print("WARNING: Could not find or fill Country field")
+    log.warning("Could not find or fill Country field")
     return 0
 
+# Look for other custom dropdown buttons (excluding Country)
+DROPDOWN_SELECTORS = [
+    "//button[@aria-haspopup='listbox']",
+    "//button[contains(@aria-label, 'State')]",
+    "//button[contains(@aria-label, 'City')]",
+    "//button[contains(@class, 'dropdown')]",
+    "//button[contains(@class, 'select')]"
+]
+
+def dropdown_key(combined_text):
+    """Config key for a custom dropdown button, or None."""
+    if any(word in combined_text for word in ['state', 'province']):
+        return 'state'
+    elif any(word in combined_text for word in ['city', 'town']):
+        return 'city'
+    return None
+
+def read_button_signatures(driver, buttons):
+    """aria-label, id, text and position of each button, in one round trip."""
+    if not buttons:
+        return []
+    rows = driver.execute_script(
+        "return arguments[0].map(b => [b.getAttribute('aria-label') || '', b.id || '', (b.innerText || '').trim()]);",
+        buttons)
+    return [{'aria_label': aria_label, 'id': button_id, 'text': text, 'index': index}
+            for index, (aria_label, button_id, text) in enumerate(rows)]
+
+def relocate_button(driver, selector, signature):
+    """Find a re-rendered dropdown button again by aria-label and id, then text, then position.
+    
+    Returns None unless exactly one button fits, so a value never goes into a different dropdown.
+    """
+    candidates = driver.find_elements(By.XPATH, selector)
+    if not candidates:
+        return None
+    matches = [(index, row) for index, row in enumerate(read_button_signatures(driver, candidates))
+               if row['aria_label'] == signature['aria_label'] and row['id'] == signature['id']]
+    if len(matches) > 1:
+        matches = [m for m in matches if m[1]['text'] == signature['text']]
+    if len(matches) > 1:
+        # Position only decides between otherwise identical buttons
+        matches = [m for m in matches if m[0] == signature['index']]
+    if len(matches) != 1:
+        return None
+    return candidates[matches[0][0]]
+
+def close_dropdown(driver):
+    """Close an open custom dropdown by clicking outside it."""
+    try:
+        driver.find_element(By.TAG_NAME, "body").click()
+    except:
+        pass
+
+def select_dropdown_option(driver, button, data_to_fill):
+    """Open a custom dropdown and click the option matching ``data_to_fill``. Returns True if selected.
+    
+    StaleElementReferenceException is left to the caller, which re-locates the button.
+    """
+    # Click the button to open dropdown
+    button.click()
+    time.sleep(1)
+    
+    # Look for the dropdown options
+    options = driver.find_elements(By.XPATH, 
+        "//div[@role='option'] | //li[@role='option'] | //div[contains(@class, 'option')] | //li[contains(@class, 'option')]")
+    
+    if not options:
+        # Try alternative selectors
+        options = driver.find_elements(By.XPATH, 
+            "//div[contains(@class, 'menu')]//div | //ul[contains(@class, 'menu')]//li")
+    
+    # Find and click the matching option
+    for option in options:
+        option_text = option.text.strip()
+        if option_text.lower() == data_to_fill.lower():
+            option.click()
+            log.log(SUCCESS, "Selected %s", data_to_fill)
+            return True
+        elif data_to_fill.lower() in option_text.lower():
+            option.click()
+            log.log(SUCCESS, "Selected %s (partial match for %s)", option_text, data_to_fill)
+            return True
+    
+    log.warning("Could not find option '%s' in dropdown", data_to_fill)
+    log.debug("Available options: %s", LazyTexts(options))
+    # Close dropdown if no match found
+    close_dropdown(driver)
+    return False
+
 def handle_other_custom_dropdowns(driver):
     """Handle other custom dropdown buttons (not Country)."""
     filled_count = 0
     
-    # Look for other custom dropdown buttons (excluding Country)
-    dropdown_selectors = [
-        "//button[@aria-haspopup='listbox']",
-        "//button[contains(@aria-label, 'State')]",
-        "//button[contains(@aria-label, 'City')]",
-        "//button[contains(@class, 'dropdown')]",
-        "//button[contains(@class, 'select')]"
-    ]
-    
-    for selector in dropdown_selectors:
+    for selector in DROPDOWN_SELECTORS:
         try:
             buttons = driver.find_elements(By.XPATH, selector)
-            for button in buttons:
-                if not button.is_displayed():
-                    continue
-                
+            # Read every signature before any click re-renders the list
+            signatures = read_button_signatures(driver, buttons)
+            for button, signature in zip(buttons, signatures):
                 # Skip Country fields (already handled)
-                button_text = button.text.strip()
-                aria_label = button.get_attribute('aria-label') or ''
+                button_text = signature['text']
+                aria_label = signature['aria_label']
                 if any(word in aria_label.lower() for word in ['country', 'region']):
                     continue
                 
-                # Get button info
-                button_id = button.get_attribute('id') or ''
-                
                 # Determine what to fill based on button context
-                data_to_fill = None
-                combined_text = f"{button_text} {aria_label} {button_id}".lower()
+                combined_text = f"{button_text} {aria_label} {signature['id']}".lower()
+                data_to_fill = value_for_key(dropdown_key(combined_text))
                 
-                if any(word in combined_text for word in ['state', 'province']):
-                    data_to_fill = PERSONAL_INFO.get('state')
-                elif any(word in combined_text for word in ['city', 'town']):
-                    data_to_fill = PERSONAL_INFO.get('city')
+                if not data_to_fill:
+                    continue
                 
-                if data_to_fill:
-                    print(f"INFO: Found custom dropdown: {button_text} - filling with {data_to_fill}")
-                    
+                try:
+                    displayed = button.is_displayed()
+                except StaleElementReferenceException:
+                    # An earlier selection re-rendered the form; find just this button again
+                    button = relocate_button(driver, selector, signature)
+                    if button is None:
+                        log.debug("Dropdown '%s' re-rendered and could not be found again", aria_label or button_text)
+                        continue
+                    displayed = button.is_displayed()
+                if not displayed:
+                    continue
+                
+                log.info("Found custom dropdown: %s - filling with %s", button_text, data_to_fill)
+                
+                # A click or option lookup can also hit a re-render; re-locate the button and retry once
+                for attempt in range(2):
                     try:
-                        # Click the button to open dropdown
-                        button.click()
-                        time.sleep(1)
-                        
-                        # Look for the dropdown options
-                        options = driver.find_elements(By.XPATH, 
-                            "//div[@role='option'] | //li[@role='option'] | //div[contains(@class, 'option')] | //li[contains(@class, 'option')]")
-                        
-                        if not options:
-                            # Try alternative selectors
-                            options = driver.find_elements(By.XPATH, 
-                                "//div[contains(@class, 'menu')]//div | //ul[contains(@class, 'menu')]//li")
-                        
-                        # Find and click the matching option
-                        option_found = False
-                        for option in options:
-                            option_text = option.text.strip()
-                            if option_text.lower() == data_to_fill.lower():
-                                option.click()
-                                print(f"SUCCESS: Selected {data_to_fill}")
-                                filled_count += 1
-                                option_found = True
-                                break
-                            elif data_to_fill.lower() in option_text.lower():
-                                option.click()
-                                print(f"SUCCESS: Selected {option_text} (partial match for {data_to_fill})")
-                                filled_count += 1
-                                option_found = True
-                                break
-                        
-                        if not option_found:
-                            print(f"WARNING: Could not find option '{data_to_fill}' in dropdown")
-                            print(f"Available options: {[opt.text for opt in options]}")
-                            
-                            # Close dropdown if no match found
-                            try:
-                                # Try to click outside or press Escape
-                                driver.find_element(By.TAG_NAME, "body").click()
-                            except:
-                                pass
-                    
+                        if select_dropdown_option(driver, button, data_to_fill):
+                            filled_count += 1
+                        break
+                    except StaleElementReferenceException:
+                        close_dropdown(driver)
+                        button = relocate_button(driver, selector, signature) if attempt == 0 else None
+                        if button is None:
+                            log.warning("Dropdown '%s' re-rendered and could not be found again", aria_label or button_text)
+                            break
+                        log.debug("Re-located stale dropdown '%s'", aria_label or button_text)
                     except Exception as e:
-                        print(f"ERROR: Could not handle custom dropdown: {str(e)}")
-                        # Try to close dropdown
-                        try:
-                            driver.find_element(By.TAG_NAME, "body").click()
-                        except:
-                            pass
+                        log.error("Could not handle custom dropdown: %s", e)
+                        close_dropdown(driver)
+                        break
                 
         except Exception as e:
-            print(f"ERROR: Could not process dropdown selector {selector}: {str(e)}")
+            log.error("Could not process dropdown selector %s: %s", selector, e)
             continue
     
     return filled_count
 
 def handle_login(driver):
     """Handle login if required."""
-    print("INFO: Checking if login is required...")
+    log.info("Checking if login is required...")
     
     # Check for login indicators
     page_text = driver.page_source.lower()
     login_indicators = ['login', 'signin', 'sign-in', 'sign in', 'email', 'password']
     
     if any(indicator in page_text for indicator in login_indicators):
-        print("INFO: Login detected - please login manually")
+        log.info("Login detected - please login manually")
         
         if not APPLICATION_SETTINGS["headless_mode"]:
             input("Press Enter after logging in...")
             time.sleep(3)
             return True
         else:
-            print("WARNING: Cannot login manually in headless mode")
+            log.warning("Cannot login manually in headless mode")
             return False
     
     return True
 
+# One round trip that reports every required-but-empty or invalid field with its label and error text
+FORM_ISSUES_SCRIPT = ROOTS_PRELUDE + """
+const issues = [];
+const seenGroups = new Map();
+const fields = queryAll(
+    "input:not([type=hidden]):not([disabled]), select:not([disabled]), textarea:not([disabled])");
+
+for (const el of fields) {
+    const type = (el.type || "").toLowerCase();
+    const root = el.getRootNode();
+    const textOf = id => {
+        const target = id && root.getElementById(id);
+        return target ? target.innerText.trim() : "";
+    };
+    // File inputs are usually hidden behind a styled button
+    if (!isVisible(el) && type !== "file") continue;
+
+    let empty;
+    if (type === "radio" || type === "checkbox") {
+        if (el.name) {
+            if (seenGroups.has(root) && seenGroups.get(root).has(el.name)) continue;
+            if (!seenGroups.has(root)) seenGroups.set(root, new Set());
+            seenGroups.get(root).add(el.name);
+            empty = !root.querySelector(`input[name="${CSS.escape(el.name)}"]:checked`);
+        } else {
+            empty = !el.checked;
+        }
+    } else {
+        empty = !(el.value || "").trim();
+    }
+
+    const required = el.required || el.getAttribute("aria-required") === "true" ||
+        /required/i.test(el.getAttribute("class") || "") || (el.placeholder || "").includes("*");
+    const invalid = el.getAttribute("aria-invalid") === "true" || (!empty && el.validity && !el.validity.valid);
+    if (!(required && empty) && !invalid) continue;
+
+    let label = el.labels && el.labels.length ? el.labels[0].innerText.trim() : "";
+    if (!label) label = el.getAttribute("aria-label") || "";
+    if (!label) label = (el.getAttribute("aria-labelledby") || "").split(/\\s+/).map(textOf).join(" ").trim();
+    if (!label) {
+        const prev = el.previousElementSibling;
+        label = prev ? prev.innerText.trim() : "";
+    }
+
+    let message = "";
+    for (const attr of ["aria-errormessage", "aria-describedby"]) {
+        message = (el.getAttribute(attr) || "").split(/\\s+/).map(textOf).join(" ").trim();
+        if (message) break;
+    }
+    if (!message && invalid) {
+        const container = el.closest("[data-automation-id], .form-group, .field, fieldset") || el.parentElement;
+        const alert = container && container.querySelector("[role=alert], [data-automation-id=errorMessage], .error, .error-message");
+        message = alert ? alert.innerText.trim() : "";
+    }
+    if (!message) message = el.validationMessage || "";
+
+    issues.push({
+        element: el, tag: el.tagName.toLowerCase(), type: type, id: el.id || "", name: el.name || "",
+        placeholder: el.placeholder || "", label: label.split("\\n")[0].slice(0, 80),
+        value: el.tagName === "SELECT" ? (el.selectedOptions[0] ? el.selectedOptions[0].text : "") : (el.value || ""),
+        automation_id: (el.closest("[data-automation-id]") || {getAttribute: () => ""}).getAttribute("data-automation-id"),
+        sibling_index: el.parentElement ? Array.from(el.parentElement.children).filter(c => c.tagName === el.tagName).indexOf(el) : 0,
+        required: required, empty: empty, invalid: invalid, message: message.slice(0, 200)
+    });
+}
+return {items: issues, frames: frames};
+"""
+
+def probe_form_issues(driver):
+    """Return required-but-empty and invalid fields in the page and its frames, with labels and error messages."""
+    try:
+        return run_in_frames(driver, FORM_ISSUES_SCRIPT)
+    except WebDriverException as e:
+        log.warning("Could not probe form for required fields: %s", e)
+        return []
+
+def refill_form_issues(driver, issues):
+    """Try to fill probed fields from PERSONAL_INFO. Returns the number filled."""
+    refilled = 0
+    for frame_path, frame_issues in group_by_frame(issues):
+        if not switch_to_frame_path(driver, frame_path):
+            continue
+        for issue in frame_issues:
+            if issue["type"] in ('radio', 'checkbox'):
+                continue
+            
+            combined_text = f"{issue['id']} {issue['name']} {issue['placeholder']} {issue['label']}".lower()
+            # Country is handled separately with its own matching rules
+            if 'country' in combined_text:
+                continue
+            
+            data_to_fill = match_field_data(combined_text)
+            if not data_to_fill:
+                continue
+            
+            # The page already rejected this value; typing it again cannot help, so leave it for the user
+            if issue["invalid"] and issue["value"].strip().lower() == str(data_to_fill).strip().lower():
+                log.info("Not re-filling invalid field '%s': '%s' was rejected",
+                         issue["label"] or issue["name"] or issue["id"], data_to_fill)
+                continue
+            
+            log.info("Re-filling %s field '%s'%s", "invalid" if issue["invalid"] else "required",
+                     issue["label"] or issue["name"] or issue["id"],
+                     f" ({issue['message']})" if issue["message"] else "")
+            try:
+                if retry_stale(driver, issue, lambda elem: fill_element(elem, data_to_fill, issue["type"] or 'text')):
+                    refilled += 1
+            except Exception as e:
+                log.error("Could not re-fill field: %s", e)
+                capture_error(driver, "refill_field", e)
+    driver.switch_to.default_content()
+    return refilled
+
 def handle_remaining_fields(driver):
     """Handle remaining required fields that couldn't be filled automatically."""
-    print("INFO: Checking for remaining required fields...")
-    
-    # Look for required fields (usually marked with *)
-    required_selectors = [
-        "//input[contains(@class, 'required')]",
-        "//select[contains(@class, 'required')]",
-        "//textarea[contains(@class, 'required')]",
-        "//input[contains(@placeholder, '*')]",
-        "//select[contains(@placeholder, '*')]",
-        "//textarea[contains(@placeholder, '*')]"
-    ]
-    
-    remaining_fields = []
-    for selector in required_selectors:
-        try:
-            elements = driver.find_elements(By.XPATH, selector)
-            for element in elements:
-                if element.is_displayed():
-                    current_value = element.get_attribute('value') or ''
-                    if not current_value.strip():
-                        remaining_fields.append(element)
-        except:
-            continue
+    log.info("Checking for remaining required and invalid fields...")
+    
+    remaining_fields = probe_form_issues(driver)
+    
+    # Automatic pass first, so the user is only asked about fields we cannot fill
+    refilled = refill_form_issues(driver, remaining_fields) if remaining_fields else 0
+    metrics.record_fields("auto", refilled)
+    if refilled:
+        remaining_fields = probe_form_issues(driver)
+    
+    for issue in remaining_fields:
+        log.warning("%s field '%s'%s", "Invalid" if issue["invalid"] else "Required",
+                    issue["label"] or issue["name"] or issue["id"],
+                    f": {issue['message']}" if issue["message"] else "")
     
     if remaining_fields and not APPLICATION_SETTINGS["headless_mode"]:
-        print(f"INFO: Found {len(remaining_fields)} remaining required fields")
+        log.info("Found %s remaining required fields", len(remaining_fields))
         response = input("Would you like to fill remaining fields manually? (y/n): ").strip().lower()
         
         if response == 'y':
-            for i, field in enumerate(remaining_fields):
+            manual_count = 0
+            for i, issue in enumerate(remaining_fields):
                 try:
-                    field_type = field.get_attribute('type') or 'text'
-                    field_id = field.get_attribute('id') or ''
-                    field_name = field.get_attribute('name') or ''
-                    field_placeholder = field.get_attribute('placeholder') or ''
+                    if not switch_to_frame_path(driver, issue["frame"]):
+                        continue
+                    field = issue["element"]
+                    field_type = issue["type"] or 'text'
                     
                     print(f"\n--- Field {i+1} ---")
-                    print(f"Type: {field.tag_name} ({field_type})")
-                    print(f"ID: {field_id}")
-                    print(f"Name: {field_name}")
-                    print(f"Placeholder: {field_placeholder}")
+                    print(f"Type: {issue['tag']} ({field_type})")
+                    print(f"Label: {issue['label']}")
+                    print(f"ID: {issue['id']}")
+                    print(f"Name: {issue['name']}")
+                    print(f"Placeholder: {issue['placeholder']}")
+                    if issue["value"]:
+                        print(f"Current value: {issue['value']}")
+                    if issue["message"]:
+                        print(f"Error: {issue['message']}")
                     
                     user_input = input("Enter value (or 'skip'): ").strip()
                     
                     if user_input.lower() != 'skip':
                         if field_type == 'file':
                             field.send_keys(os.path.abspath(user_input))
-                            print(f"SUCCESS: Uploaded {user_input}")
-                        elif field.tag_name == 'select':
+                            log.log(SUCCESS, "Uploaded %s", user_input)
+                        elif issue["tag"] == 'select':
                             select = Select(field)
                             select.select_by_visible_text(user_input)
-                            print(f"SUCCESS: Selected {user_input}")
+                            log.log(SUCCESS, "Selected %s", user_input)
                         else:
                             field.clear()
                             field.send_keys(user_input)
-                            print(f"SUCCESS: Filled with {user_input}")
+                            log.log(SUCCESS, "Filled with %s", user_input)
+                        manual_count += 1
                 except Exception as e:
-                    print(f"ERROR: Could not fill field: {str(e)}")
+                    log.error("Could not fill field: %s", e)
+            driver.switch_to.default_content()
+            metrics.record_fields("manual", manual_count)
     
     return len(remaining_fields)
 
+# Submit button rules in priority order: (what to check, text to look for)
+SUBMIT_BUTTON_RULES = [
+    ("text_ci", "submit"),
+    ("text_ci", "apply"),
+    ("text", "Submit Application"),
+    ("text", "Apply"),
+    ("text", "Submit"),
+    ("text", "Continue"),
+    ("text", "Next"),
+    ("text", "Save"),
+    ("text", "Save and Continue"),
+    ("text", "Finish"),
+    ("input_type", "submit"),
+    ("button_type", "submit"),
+    ("class", "submit"),
+    ("class", "apply"),
+    ("class", "continue"),
+    ("class", "next"),
+    ("class", "save"),
+    ("class", "finish")
+]
+
+def button_matches_rule(button, rule):
+    kind, value = rule
+    if kind == "text_ci":
+        return value in button['text'].lower()
+    if kind == "text":
+        return value in button['text']
+    if kind == "input_type":
+        return button['tag'] == 'input' and button['type'] == value
+    if kind == "button_type":
+        return button['tag'] == 'button' and button['type'] == value
+    return value in button['cls']
+
+def click_scanned_button(driver, button):
+    """Click a button returned by scan_buttons inside its own frame."""
+    try:
+        if switch_to_frame_path(driver, button['frame']):
+            button['element'].click()
+            return True
+        return False
+    finally:
+        driver.switch_to.default_content()
+
 def submit_application(driver):
     """Submit the application."""
-    print("INFO: Looking for submit button...")
-    
-    submit_selectors = [
-        "//button[contains(translate(text(), 'SUBMIT', 'submit'), 'submit')]",
-        "//button[contains(translate(text(), 'APPLY', 'apply'), 'apply')]",
-        "//button[contains(text(), 'Submit Application')]",
-        "//button[contains(text(), 'Apply')]",
-        "//button[contains(text(), 'Submit')]",
-        "//button[contains(text(), 'Continue')]",
-        "//button[contains(text(), 'Next')]",
-        "//button[contains(text(), 'Save')]",
-        "//button[contains(text(), 'Save and Continue')]",
-        "//button[contains(text(), 'Finish')]",
-        "//input[@type='submit']",
-        "//button[@type='submit']",
-        "//button[contains(@class, 'submit')]",
-        "//button[contains(@class, 'apply')]",
-        "//button[contains(@class, 'continue')]",
-        "//button[contains(@class, 'next')]",
-        "//button[contains(@class, 'save')]",
-        "//button[contains(@class, 'finish')]"
-    ]
-    
-    for selector in submit_selectors:
+    log.info("Looking for submit button...")
+    
+    try:
+        buttons = [b for b in scan_buttons(driver) if b['visible'] and b['enabled']]
+    except WebDriverException as e:
+        log.warning("Could not scan for buttons: %s", e)
+        buttons = []
+    
+    for rule in SUBMIT_BUTTON_RULES:
+        submit_btn = next((b for b in buttons if button_matches_rule(b, rule)), None)
+        if submit_btn is None:
+            continue
         try:
-            submit_btn = driver.find_element(By.XPATH, selector)
-            if submit_btn.is_displayed() and submit_btn.is_enabled():
-                print(f"INFO: Found submit button: {submit_btn.text}")
-                
-                if not APPLICATION_SETTINGS["headless_mode"]:
+            log.info("Found submit button: %s", submit_btn['text'])
+            
+            if not APPLICATION_SETTINGS["headless_mode"]:
+                with metrics.paused():
                     confirm = input("Submit application? (y/n): ").strip().lower()
-                    if confirm != 'y':
-                        print("Submission cancelled.")
-                        return False
-                
-                submit_btn.click()
-                print("SUCCESS: Application submitted!")
+                if confirm != 'y':
+                    log.info("Submission cancelled.")
+                    return False
+            
+            if click_scanned_button(driver, submit_btn):
+                log.log(SUCCESS, "Application submitted!")
                 time.sleep(5)
                 return True
         except:
             continue
     
     # If no submit button found, look for any clickable buttons
-    print("INFO: No standard submit button found, looking for any clickable buttons...")
+    log.info("No standard submit button found, looking for any clickable buttons...")
     try:
-        buttons = driver.find_elements(By.XPATH, "//button[not(@disabled)]")
         for button in buttons:
-            if button.is_displayed() and button.is_enabled():
-                button_text = button.text.strip().lower()
-                if any(word in button_text for word in ['submit', 'apply', 'continue', 'next', 'save', 'finish']):
-                    print(f"INFO: Found potential submit button: {button.text}")
-                    
-                    if not APPLICATION_SETTINGS["headless_mode"]:
-                        confirm = input(f"Click '{button.text}'? (y/n): ").strip().lower()
-                        if confirm != 'y':
-                            continue
-                    
-                    button.click()
-                    print("SUCCESS: Button clicked!")
+            if button['tag'] != 'button':
+                continue
+            button_text = button['text'].lower()
+            if any(word in button_text for word in ['submit', 'apply', 'continue', 'next', 'save', 'finish']):
+                log.info("Found potential submit button: %s", button['text'])
+                
+                if not APPLICATION_SETTINGS["headless_mode"]:
+                    with metrics.paused():
+                        confirm = input(f"Click '{button['text']}'? (y/n): ").strip().lower()
+                    if confirm != 'y':
+                        continue
+                
+                if click_scanned_button(driver, button):
+                    log.log(SUCCESS, "Button clicked!")
                     time.sleep(5)
                     return True
     except:
         pass
     
-    print("WARNING: Could not find submit button")
+    log.warning("Could not find submit button")
     return False
 
 def click_add_buttons(driver):
     """Clicks 'Add' buttons for Experience and Education sections."""
-    print("INFO: Clicking 'Add' buttons if available...")
+    log.info("Clicking 'Add' buttons if available...")
 
     try:
         add_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Add') or contains(text(), 'Add Another')]")
         for btn in add_buttons:
             if btn.is_displayed():
-                print(f"INFO: Clicking '{btn.text}'")
+                log.info("Clicking '%s'", btn.text)
                 btn.click()
                 time.sleep(2)  # allow section to expand
     except Exception as e:
-        print(f"WARNING: Could not click add buttons: {str(e)}")
+        log.warning("Could not click add buttons: %s", e)
 
 def fill_experience_fields(driver):
-    print("INFO: Filling Work Experience section...")
+    log.info("Filling Work Experience section...")
     try:
         driver.find_element(By.XPATH, "//input[contains(@name, 'jobTitle')]").send_keys("Intern")
         driver.find_element(By.XPATH, "//input[contains(@name, 'company')]").send_keys("RecommerceX")
@@ -679,12 +848,12 @@ def fill_experience_fields(driver):
         to_field = driver.find_elements(By.XPATH, "//input[contains(@placeholder, 'MM/YYYY')]")[1]
         to_field.send_keys("072025")
 
-        print("SUCCESS: Work experience filled.")
+        log.log(SUCCESS, "Work experience filled.")
     except Exception as e:
-        print(f"WARNING: Could not fill experience: {str(e)}")
+        log.warning("Could not fill experience: %s", e)
 
 def fill_education_fields(driver):
-    print("INFO: Filling Education section...")
+    log.info("Filling Education section...")
     try:
         driver.find_element(By.XPATH, "//input[contains(@name, 'school')]") \
               .send_keys(PERSONAL_INFO["university_name"])
@@ -700,28 +869,28 @@ def fill_education_fields(driver):
         to_input = driver.find_elements(By.XPATH, "//input[contains(@placeholder, 'YYYY')]")[1]
         to_input.send_keys("2026")
 
-        print("SUCCESS: Education section filled.")
+        log.log(SUCCESS, "Education section filled.")
     except Exception as e:
-        print(f"WARNING: Could not fill education: {str(e)}")
+        log.warning("Could not fill education: %s", e)
 
 def upload_resume_and_links(driver):
     try:
-        print("INFO: Uploading resume and LinkedIn...")
+        log.info("Uploading resume and LinkedIn...")
         # Resume
         file_input = driver.find_element(By.XPATH, "//input[@type='file']")
         file_input.send_keys(FILE_PATHS["resume_path"])
-        print("SUCCESS: Resume uploaded")
+        log.log(SUCCESS, "Resume uploaded")
 
         # LinkedIn
         linkedin_input = driver.find_element(By.XPATH, "//input[contains(@placeholder, 'LinkedIn')]")
         linkedin_input.send_keys(PERSONAL_INFO["linkedin_url"])
-        print("SUCCESS: LinkedIn URL entered")
+        log.log(SUCCESS, "LinkedIn URL entered")
     except Exception as e:
-        print(f"WARNING: Could not upload resume or LinkedIn: {e}")
+        log.warning("Could not upload resume or LinkedIn: %s", e)
 
 
 def click_add_buttons_if_needed(driver):
-    print("INFO: Checking if 'Add' buttons are needed...")
+    log.info("Checking if 'Add' buttons are needed...")
 
     def field_exists(field_label):
         try:
@@ -736,50 +905,52 @@ def click_add_buttons_if_needed(driver):
             if exp_add_btns:
                 driver.execute_script("arguments[0].scrollIntoView(true);", exp_add_btns[0])
                 exp_add_btns[0].click()
-                print("SUCCESS: Clicked 'Add' button for Experience")
+                log.log(SUCCESS, "Clicked 'Add' button for Experience")
 
         if not (field_exists("School") or field_exists("University")):
             edu_add_btns = driver.find_elements(By.XPATH, "//button[contains(@data-automation-id,'add-button')]")
             if len(edu_add_btns) > 1:
                 driver.execute_script("arguments[0].scrollIntoView(true);", edu_add_btns[1])
                 edu_add_btns[1].click()
-                print("SUCCESS: Clicked 'Add' button for Education")
+                log.log(SUCCESS, "Clicked 'Add' button for Education")
 
     except Exception as e:
-        print(f"WARNING: Could not click add buttons: {e}")
+        log.warning("Could not click add buttons: %s", e)
 
 
 
 def apply_to_job(driver, job_url):
     """Main job application logic."""
-    print(f"\n--- Starting Application for: {job_url} ---")
+    log.info("--- Starting Application for: %s ---", job_url)
     
     try:
-        driver.get(job_url)
-        time.sleep(5)
+        with metrics.stage("load"):
+            driver.get(job_url)
+            time.sleep(5)
 
-        print(f"INFO: Page title: {driver.title}")
-        print(f"INFO: Current URL: {driver.current_url}")
+        log.info("Page title: %s", driver.title)
+        log.info("Current URL: %s", driver.current_url)
         
         # Handle login if needed
         if not handle_login(driver):
-            return False
+            raise LoginWallError(f"Login required for {job_url}")
 
         auto_select_radio_yes_no(driver)
         filled_count = find_and_fill_fields(driver)
 
         if filled_count > 0:
-            print(f"INFO: Successfully filled {filled_count} fields")
+            log.info("Successfully filled %s fields", filled_count)
         else:
-            print("WARNING: No fields were filled automatically")
+            log.warning("No fields were filled automatically")
 
         handle_remaining_fields(driver)
-        success = submit_application(driver)
+        with metrics.stage("submit"):
+            success = submit_application(driver)
 
         input("If this is a multi-step form, click 'Save and Continue'. Press Enter when next section is visible...")
 
         while success:
-            print("INFO: Continuing to next section of the form...")
+            log.info("Continuing to next section of the form...")
             
             filled_again = find_and_fill_fields(driver)
             handle_remaining_fields(driver)
@@ -791,66 +962,408 @@ def apply_to_job(driver, job_url):
             fill_education_fields(driver)
             upload_resume_and_links(driver)
 
-            success = submit_application(driver)
+            with metrics.stage("submit"):
+                success = submit_application(driver)
 
         return success
 
+    except (WebDriverException, LoginWallError) as e:
+        capture_error(driver, "apply", e, url=job_url)
+        # Let the caller back off this host
+        raise
     except Exception as e:
-        print(f"ERROR: Failed to apply to {job_url}: {str(e)}")
+        log.error("Failed to apply to %s: %s", job_url, e)
+        capture_error(driver, "apply", e, url=job_url)
         return False
 
 
-def main():
-    """Main execution function."""
-    job_urls_file = os.path.join(os.path.dirname(__file__), "job_urls.txt")
+def wait_for_page(driver, settle_time):
+    """Wait for the document to finish loading, then give client-side rendering a moment."""
+    try:
+        WebDriverWait(driver, APPLICATION_SETTINGS["implicit_wait_time"]).until(
+            lambda d: d.execute_script("return document.readyState") == "complete")
+    except TimeoutException:
+        log.warning("Page did not finish loading, planning what is there")
+    time.sleep(settle_time)
+
+def plan_country_field(driver):
+    """'matched', 'unmatched', 'custom' (options only visible after clicking) or 'missing'.
+    
+    Mirrors handle_country_field_first: only buttons and selects are filled there.
+    """
+    for selector in COUNTRY_SELECTORS:
+        for element in driver.find_elements(By.XPATH, selector):
+            try:
+                if not element.is_displayed():
+                    continue
+                if element.tag_name == 'select':
+                    options = Select(element).options
+                    return 'matched' if any(is_india_option(option.text) for option in options) else 'unmatched'
+                if element.tag_name == 'button':
+                    return 'custom'
+                # Text inputs are skipped by the fill loop, so they need a human
+                return 'unmatched'
+            except StaleElementReferenceException:
+                continue
+    return 'missing'
+
+def plan_fill(driver, job_url):
+    """Run field discovery and matching on a posting without typing, clicking or submitting."""
+    log.info("--- Planning: %s ---", job_url)
+    plan = {
+        "url": job_url,
+        "time": time.time(),
+        "fields": [],
+        "radio_questions": [],
+        "dropdowns": [],
+        "required_unknown": [],
+    }
+    
+    with metrics.stage("load"):
+        driver.get(job_url)
+        wait_for_page(driver, APPLICATION_SETTINGS.get("dry_run_settle_time", 2))
+    plan["final_url"] = driver.current_url
+    plan["title"] = driver.title
+    
+    # Nothing is waited for in a dry run: a missing element should cost nothing, not the implicit wait
+    driver.implicitly_wait(0)
+    try:
+        plan["login_wall"] = bool(driver.find_elements(By.XPATH, "//input[@type='password']"))
+        plan["country"] = plan_country_field(driver)
+        
+        with metrics.stage("scan"):
+            fields = scan_fields(driver)
+        for field in fields:
+            if not field['visible']:
+                continue
+            combined_text = field_text(field)
+            if any(word in combined_text for word in ['country', 'country/region']):
+                continue
+            
+            combined_text = f"{combined_text} {field['label']}".lower()
+            key = match_scanned_key(field, combined_text)
+            
+            if field['value'].strip() and field['type'] not in ['select-one', 'radio', 'checkbox']:
+                status = 'prefilled'
+            elif key is None:
+                status = 'unmatched'
+            elif field['type'] == 'file' and not os.path.exists(value_for_key(key) or ''):
+                status = 'missing_file'
+            else:
+                status = 'matched'
+            
+            plan["fields"].append({
+                "label": field['label'] or field['name'] or field['id'],
+                "type": field['type'],
+                "key": key,
+                "status": status,
+                "frame": list(field['frame']),
+                # Kept so plans can be replayed against the matcher
+                "text": combined_text,
+                "container_text": field['container_text'],
+            })
+        
+        for fieldset in driver.find_elements(By.TAG_NAME, "fieldset"):
+            try:
+                label_text = fieldset.text.strip().lower()
+                if not is_yes_no_question(label_text):
+                    continue
+                has_no = bool(fieldset.find_elements(By.XPATH, ".//label[contains(text(), 'No')]"))
+                plan["radio_questions"].append({
+                    "question": label_text.split('\n')[0][:80],
+                    "status": 'matched' if has_no else 'unmatched',
+                })
+            except StaleElementReferenceException:
+                continue
+        
+        for selector in DROPDOWN_SELECTORS:
+            for button in driver.find_elements(By.XPATH, selector):
+                try:
+                    if not button.is_displayed():
+                        continue
+                    aria_label = button.get_attribute('aria-label') or ''
+                    if any(word in aria_label.lower() for word in ['country', 'region']):
+                        continue
+                    combined_text = f"{button.text.strip()} {aria_label} {button.get_attribute('id') or ''}".lower()
+                    key = dropdown_key(combined_text)
+                    if key:
+                        plan["dropdowns"].append({"label": aria_label or button.text.strip(), "key": key})
+                except StaleElementReferenceException:
+                    continue
+        
+        for issue in probe_form_issues(driver):
+            combined_text = f"{issue['id']} {issue['name']} {issue['placeholder']} {issue['label']}".lower()
+            if 'country' in combined_text or match_field_key(combined_text):
+                continue
+            plan["required_unknown"].append(issue["label"] or issue["name"] or issue["id"])
+    finally:
+        driver.implicitly_wait(APPLICATION_SETTINGS["implicit_wait_time"])
+    
+    plan["interventions"] = estimate_interventions(plan)
+    counts = summarize(plan)
+    log.info("Plan: %s matched, %s unmatched, %s required unknown, ~%s interventions",
+             counts["matched"], counts["unmatched"], counts["required_unknown"], counts["interventions"])
+    return plan
+
+def run_preflight(job_urls):
+    """Drop closed and duplicate postings and reorder the rest before opening a browser.
+    
+    Returns the remaining URLs and their pre-flight priority (see ``run_priority``).
+    """
+    log.info("Pre-flight checking %s URLs...", len(job_urls))
+    results = triage_urls(
+        job_urls,
+        workers=APPLICATION_SETTINGS.get("preflight_workers", 8),
+        timeout=APPLICATION_SETTINGS.get("preflight_timeout", 10),
+    )
+    
+    for result in results:
+        if result.state in ("closed", "duplicate"):
+            log.info("Skipping %s - %s (%s)", result.url, result.state, result.reason)
+        elif result.state == "error":
+            log.warning("Pre-flight failed for %s: %s", result.url, result.reason)
+        else:
+            log.debug("%s is open (%s)", result.url, result.ats or 'unknown ATS')
+    
+    ordered = order_for_run(results)
+    log.info("%s of %s URLs left after pre-flight", len(ordered), len(job_urls))
+    return ordered, {result.url: run_priority(result) for result in results}
+
+def load_job_urls(job_urls_file=None):
+    """Read job URLs from ``job_urls_file`` (default: job_urls.txt next to this script).
+    
+    Only the default file falls back to the built-in URL; a missing explicit file exits.
+    """
+    explicit = bool(job_urls_file)
+    job_urls_file = job_urls_file or os.path.join(os.path.dirname(__file__), "job_urls.txt")
     
     try:
         with open(job_urls_file, "r") as f:
-            job_application_urls = [url.strip() for url in f.readlines() if url.strip()]
+            return [url.strip() for url in f.readlines() if url.strip()]
     except FileNotFoundError:
-        print("WARNING: job_urls.txt not found. Using default URL...")
-        job_application_urls = ["https://cornerstone.csod.com/ux/ats/careersite/2/requisition/10494/application?c=cornerstone&source=LinkedIn&jobboardid=0#1"]
+        if explicit:
+            log.error("URL file %s not found.", job_urls_file)
+            sys.exit(1)
+        log.warning("job_urls.txt not found. Using default URL...")
+        return ["https://cornerstone.csod.com/ux/ats/careersite/2/requisition/10494/application?c=cornerstone&source=LinkedIn&jobboardid=0#1"]
+
+def plan_file_path():
+    return os.path.join(os.path.dirname(__file__), APPLICATION_SETTINGS.get("plan_file", "fill_plans.jsonl"))
+
+def journal_file_path():
+    return os.path.join(os.path.dirname(__file__), APPLICATION_SETTINGS.get("journal_file", "journal.jsonl"))
+
+def run_batch(job_urls, process, mode="apply", priority=None):
+    """Run ``process(driver, url)`` over the URLs with per-host pacing and browser supervision.
     
-    if not job_application_urls:
-        print("ERROR: No job URLs provided.")
-        sys.exit(1)
+    ``priority(url)`` (lower first) decides which ready host goes next; see HostScheduler.
+    Every URL's outcome is appended to the journal under ``mode``.
+    Returns (successful URLs, [(url, reason)] failures, browser recycle count).
+    """
+    global artifact_store
+    successful = []
+    failed = []
     
-    driver = None
-    successful_applications = []
-    failed_applications = []
+    scheduler = HostScheduler(
+        job_urls,
+        min_interval=APPLICATION_SETTINGS["pause_between_applications"],
+        burst=APPLICATION_SETTINGS.get("per_host_burst", 1),
+        backoff_base=APPLICATION_SETTINGS.get("backoff_base_seconds", 30),
+        backoff_max=APPLICATION_SETTINGS.get("backoff_max_seconds", 600),
+        priority=priority,
+    )
+    supervisor = SessionSupervisor(
+        lambda: metrics.instrument_driver(initialize_driver(headless=APPLICATION_SETTINGS["headless_mode"])),
+        max_applications=APPLICATION_SETTINGS.get("recycle_after_applications", 25),
+        max_rss_mb=APPLICATION_SETTINGS.get("recycle_browser_rss_mb", 1500),
+    )
+    
+    if APPLICATION_SETTINGS["take_screenshot_on_error"]:
+        artifact_store = ArtifactStore(
+            os.path.join(os.path.dirname(__file__), APPLICATION_SETTINGS.get("artifact_dir", "artifacts")),
+            max_bytes=APPLICATION_SETTINGS.get("artifact_max_mb", 200) * 1024 * 1024,
+        )
     
     try:
-        driver = initialize_driver(headless=APPLICATION_SETTINGS["headless_mode"])
+        # Start the first browser up front so a broken setup fails fast
+        supervisor.driver
         
-        for url in job_application_urls:
+        while True:
+            url = scheduler.acquire()
+            if url is None:
+                break
+            
+            begin_application(url)
+            started = time.time()
+            outcome = ("error", "")
+            failure_kind = ""
             try:
-                success = apply_to_job(driver, url)
-                if success:
-                    successful_applications.append(url)
-                    print(f"SUCCESS: Applied to {url}")
+                if process(supervisor.driver, url):
+                    successful.append(url)
+                    scheduler.record_success(url)
+                    outcome = ("success", "")
                 else:
-                    failed_applications.append((url, "Application failed"))
-                    print(f"FAILED: Could not apply to {url}")
-                
-                if url != job_application_urls[-1]:
-                    time.sleep(APPLICATION_SETTINGS["pause_between_applications"])
+                    failed.append((url, "Application failed"))
+                    outcome = ("failed", "Application failed")
+                    failure_kind = "not_submitted"
                     
+            except WebDriverException as e:
+                outcome = ("error", f"{type(e).__name__}: {e}")
+                failure_kind = type(e).__name__
+                log.error("Failed to process %s: %s", url, e)
+                failed.append((url, str(e)))
+                scheduler.record_failure(url)
+                supervisor.handle_error(e)
+                continue
+            except LoginWallError as e:
+                outcome = ("login_wall", str(e))
+                failure_kind = "login_wall"
+                log.error("Failed to process %s: %s", url, e)
+                failed.append((url, str(e)))
+                scheduler.record_failure(url)
+                continue
             except Exception as e:
-                print(f"ERROR: Failed to process {url}: {str(e)}")
-                failed_applications.append((url, str(e)))
+                outcome = ("error", f"{type(e).__name__}: {e}")
+                failure_kind = type(e).__name__
+                log.error("Failed to process %s: %s", url, e)
+                failed.append((url, str(e)))
                 continue
+            finally:
+                append_entry(journal_file_path(), url, mode, outcome[0], outcome[1], time.time() - started)
+                # Exception type rather than message keeps the per-host failure series few
+                metrics.record_application(host_of(url), outcome[0], failure_kind)
+                # Flush the trace while the driver is still the one the records came from
+                end_application()
+                # Nothing to recycle for once the queue is empty; quit() below closes the browser
+                if scheduler.pending():
+                    supervisor.after_application()
                 
     except Exception as e:
-        print(f"CRITICAL ERROR: {e}")
+        log.critical("Run aborted: %s", e)
+    finally:
+        supervisor.quit()
+        if artifact_store is not None:
+            artifact_store.close()
+            artifact_store = None
+    
+    return successful, failed, supervisor.recycles
+
+def apply_and_report(driver, url):
+    success = apply_to_job(driver, url)
+    if success:
+        log.log(SUCCESS, "Applied to %s", url)
+    else:
+        log.error("Could not apply to %s", url)
+    return success
+
+def dry_run(job_urls, priority=None):
+    """Write a fill plan for every URL without applying, then print them best-first."""
+    plan_path = plan_file_path()
+    plans = {}
+    
+    def plan_and_store(driver, url):
+        plan = plan_fill(driver, url)
+        append_plan(plan_path, plan)
+        plans[url] = plan
+        return True
+    
+    _, failed, _ = run_batch(job_urls, plan_and_store, mode="dry-run", priority=priority)
+    
+    print("\n=== Fill Plans (best first) ===")
+    for url in rank_urls(list(plans), plans):
+        counts = summarize(plans[url])
+        print(f"{counts['interventions']:>3} interventions | {counts['matched']:>3} matched | "
+              f"{counts['unmatched']:>3} unmatched | {counts['required_unknown']:>3} required unknown | {url}")
+    
+    if failed:
+        print("\nCould not plan:")
+        for url, reason in failed:
+            print(f"- {url}: {reason}")
+    print(f"\nPlans written to {plan_path}")
+
+def start_metrics(port):
+    """Expose live metrics if a port or snapshot file is configured. Returns a stop function."""
+    server = None
+    if port:
+        try:
+            server = metrics.serve(port)
+        except OSError as e:
+            log.warning("Could not serve metrics on port %s: %s", port, e)
+    
+    snapshots = None
+    snapshot_file = APPLICATION_SETTINGS.get("metrics_snapshot_file")
+    if snapshot_file:
+        snapshots = metrics.start_snapshots(
+            os.path.join(os.path.dirname(__file__), snapshot_file),
+            interval=APPLICATION_SETTINGS.get("metrics_snapshot_interval", 30),
+        )
+    
+    def stop():
+        if snapshots is not None:
+            snapshots.set()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    return stop
+
+def main(dry_run_mode=None, job_urls_file=None, preflight=None, metrics_port=None):
+    """Main execution function.
+    
+    Arguments left as None fall back to the command line (``--dry-run``) and APPLICATION_SETTINGS.
+    """
+    if dry_run_mode is None:
+        dry_run_mode = "--dry-run" in sys.argv[1:]
+    if preflight is None:
+        preflight = APPLICATION_SETTINGS.get("preflight_enabled", True)
+    if metrics_port is None:
+        metrics_port = APPLICATION_SETTINGS.get("metrics_port")
+    
+    setup_logging(
+        console_level=APPLICATION_SETTINGS.get("log_level", "INFO"),
+        trace_level=APPLICATION_SETTINGS.get("trace_level", "INFO"),
+        log_dir=os.path.join(os.path.dirname(__file__), APPLICATION_SETTINGS["log_dir"]) if APPLICATION_SETTINGS.get("log_dir") else None,
+    )
+    job_application_urls = load_job_urls(job_urls_file)
+    
+    if not job_application_urls:
+        log.error("No job URLs provided.")
+        sys.exit(1)
+    
+    preflight_priority = {}
+    if preflight:
+        job_application_urls, preflight_priority = run_preflight(job_application_urls)
+        if not job_application_urls:
+            log.info("No open postings left after pre-flight.")
+            return
+    
+    stop_metrics = start_metrics(metrics_port)
+    try:
+        if dry_run_mode:
+            dry_run(job_application_urls, priority=lambda url: preflight_priority.get(url, 0))
+            return
+        
+        plans = {}
+        if APPLICATION_SETTINGS.get("rank_by_fill_plans", True):
+            plans = load_plans(plan_file_path())
+            if plans:
+                job_application_urls = rank_urls(job_application_urls, plans)
+                log.info("Ordered queue using %s fill plans", sum(1 for url in job_application_urls if url in plans))
+        
+        # The scheduler serves ready hosts by this key, so the ranking holds across hosts, not just within one
+        def priority(url):
+            return (plan_priority(plans.get(url)), preflight_priority.get(url, 0))
+        
+        successful_applications, failed_applications, recycles = run_batch(
+            job_application_urls, apply_and_report, priority=priority)
     finally:
-        if driver:
-            driver.quit()
+        stop_metrics()
     
     # Summary
     print("\n=== Application Summary ===")
     print(f"Total URLs: {len(job_application_urls)}")
     print(f"Successful: {len(successful_applications)}")
     print(f"Failed: {len(failed_applications)}")
+    print(f"Browser recycles: {recycles}")
     
     if failed_applications:
         print("\nFailed Applications:")
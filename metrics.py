@@ -0,0 +1,277 @@
+# Live run metrics
+# Prometheus text over a localhost port plus periodic JSON snapshots; both opt-in
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger(__name__)
+
+STAGES = ["load", "scan", "fill", "dropdown", "submit"]
+
+# Upper bounds in seconds; the last bucket is +Inf
+BUCKETS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300]
+
+# Window for "per hour" and "per second" rates
+RATE_WINDOW = 3600
+COMMAND_RATE_WINDOW = 60
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self):
+        running = 0
+        for count in self.counts:
+            running += count
+            yield running
+
+
+class Metrics:
+    """Thread-safe counters and histograms for one run.
+
+    Recording is always on and costs a lock and a dict update; nothing is
+    exposed unless ``serve`` or ``start_snapshots`` is called.
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.started = clock()
+        self._lock = threading.Lock()
+        self.applications = Counter()  # status -> count
+        self.failures = Counter()  # (host, reason) -> count
+        self.fields = Counter()  # "auto" / "manual" -> count
+        self.stages = {stage: Histogram() for stage in STAGES}
+        self.webdriver_commands = 0
+        self._completed = deque()  # timestamps of finished applications
+        self._command_seconds = deque()  # [second, count] pairs for the command rate
+        self._local = threading.local()  # per-thread paused seconds for each open stage
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block into the ``name`` stage histogram, minus any ``paused`` time."""
+        open_stages = self._open_stages()
+        open_stages.append(0.0)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            paused = open_stages.pop()
+            self.observe(name, time.perf_counter() - started - paused)
+
+    @contextmanager
+    def paused(self):
+        """Leave the enclosed block, e.g. waiting for the operator, out of every open stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            open_stages = self._open_stages()
+            elapsed = time.perf_counter() - started
+            for index in range(len(open_stages)):
+                open_stages[index] += elapsed
+
+    def _open_stages(self):
+        if not hasattr(self._local, "stages"):
+            self._local.stages = []
+        return self._local.stages
+
+    def observe(self, name, seconds):
+        with self._lock:
+            self.stages.setdefault(name, Histogram()).observe(seconds)
+
+    def record_application(self, host, status, reason=""):
+        now = self.clock()
+        with self._lock:
+            self.applications[status] += 1
+            self._completed.append(now)
+            if status != "success":
+                self.failures[(host, reason or status)] += 1
+
+    def record_fields(self, source, count):
+        if count:
+            with self._lock:
+                self.fields[source] += count
+
+    def record_command(self):
+        second = int(self.clock())
+        with self._lock:
+            self.webdriver_commands += 1
+            if self._command_seconds and self._command_seconds[-1][0] == second:
+                self._command_seconds[-1][1] += 1
+            else:
+                self._command_seconds.append([second, 1])
+
+    def instrument_driver(self, driver):
+        """Count every WebDriver command sent by ``driver``. Returns the driver."""
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            self.record_command()
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+        return driver
+
+    def _rates(self, now):
+        """Applications per hour and WebDriver commands per second over their windows."""
+        while self._completed and self._completed[0] < now - RATE_WINDOW:
+            self._completed.popleft()
+        while self._command_seconds and self._command_seconds[0][0] < now - COMMAND_RATE_WINDOW:
+            self._command_seconds.popleft()
+
+        # At least a minute, so the first application does not read as thousands per hour
+        elapsed = min(max(now - self.started, 60.0), RATE_WINDOW)
+        per_hour = len(self._completed) * 3600 / elapsed
+        command_elapsed = min(max(now - self.started, 1.0), COMMAND_RATE_WINDOW)
+        per_second = sum(count for _, count in self._command_seconds) / command_elapsed
+        return per_hour, per_second
+
+    def snapshot(self):
+        """Current values as a JSON-serializable dict."""
+        now = self.clock()
+        with self._lock:
+            per_hour, per_second = self._rates(now)
+            return {
+                "time": now,
+                "uptime": now - self.started,
+                "applications": dict(self.applications),
+                "applications_per_hour": round(per_hour, 2),
+                "webdriver_commands_total": self.webdriver_commands,
+                "webdriver_commands_per_second": round(per_second, 2),
+                "fields_filled": dict(self.fields),
+                "stages": {
+                    name: {
+                        "count": hist.count,
+                        "sum": round(hist.total, 3),
+                        "avg": round(hist.total / hist.count, 3) if hist.count else 0.0,
+                    }
+                    for name, hist in self.stages.items()
+                },
+                "failures": [
+                    {"host": host, "reason": reason, "count": count}
+                    for (host, reason), count in self.failures.most_common()
+                ],
+            }
+
+    def prometheus(self):
+        """Current values in the Prometheus text exposition format."""
+        now = self.clock()
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f"# HELP automation_{name} {help_text}")
+            lines.append(f"# TYPE automation_{name} {kind}")
+
+        with self._lock:
+            per_hour, per_second = self._rates(now)
+
+            metric("applications_total", "counter", "Processed job URLs by outcome.")
+            for status, count in sorted(self.applications.items()):
+                lines.append(f'automation_applications_total{{status="{_escape(status)}"}} {count}')
+
+            metric("applications_per_hour", "gauge", "Processed job URLs per hour over the last hour.")
+            lines.append(f"automation_applications_per_hour {per_hour:.3f}")
+
+            metric("stage_duration_seconds", "histogram", "Time spent per application stage.")
+            for name, hist in self.stages.items():
+                label = f'stage="{_escape(name)}"'
+                for bound, running in zip(BUCKETS + ["+Inf"], hist.cumulative()):
+                    lines.append(f'automation_stage_duration_seconds_bucket{{{label},le="{bound}"}} {running}')
+                lines.append(f"automation_stage_duration_seconds_sum{{{label}}} {hist.total:.6f}")
+                lines.append(f"automation_stage_duration_seconds_count{{{label}}} {hist.count}")
+
+            metric("webdriver_commands_total", "counter", "WebDriver commands sent.")
+            lines.append(f"automation_webdriver_commands_total {self.webdriver_commands}")
+
+            metric("webdriver_commands_per_second", "gauge", "WebDriver commands per second over the last minute.")
+            lines.append(f"automation_webdriver_commands_per_second {per_second:.3f}")
+
+            metric("fields_filled_total", "counter", "Form fields filled, automatically or by hand.")
+            for source, count in sorted(self.fields.items()):
+                lines.append(f'automation_fields_filled_total{{source="{_escape(source)}"}} {count}')
+
+            metric("failures_total", "counter", "Failed job URLs by host and reason.")
+            for (host, reason), count in sorted(self.failures.items()):
+                lines.append(f'automation_failures_total{{host="{_escape(host)}",reason="{_escape(reason)}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host="127.0.0.1"):
+        """Expose /metrics (Prometheus) and /metrics.json on a background thread. Returns the server."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = metrics.prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(metrics.snapshot()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                log.debug("metrics: " + format, *args)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        log.info("Serving metrics on http://%s:%s/metrics", host, server.server_port)
+        return server
+
+    def start_snapshots(self, path, interval=30):
+        """Write ``snapshot()`` to ``path`` every ``interval`` seconds. Returns a stop Event."""
+        stop = threading.Event()
+
+        def run():
+            while True:
+                self.write_snapshot(path)
+                if stop.wait(interval):
+                    # Final snapshot so the file reflects the end of the run
+                    self.write_snapshot(path)
+                    return
+
+        threading.Thread(target=run, name="metrics-snapshot", daemon=True).start()
+        return stop
+
+    def write_snapshot(self, path):
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log.warning("Could not write metrics snapshot: %s", e)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Run-wide instance used by the application runner
+metrics = Metrics()
@@ -0,0 +1,283 @@
+# Pre-flight triage of job URLs
+# Checks postings over plain HTTP before any browser time is spent on them
+
+import gzip
+import http.client
+import re
+import ssl
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Known ATS vendors, matched against the final host and path
+ATS_PATTERNS = [
+    ("workday", re.compile(r"myworkdayjobs\.com|myworkdaysite\.com|\.wd\d+\.")),
+    ("greenhouse", re.compile(r"greenhouse\.io")),
+    ("lever", re.compile(r"lever\.co")),
+    ("icims", re.compile(r"icims\.com")),
+    ("cornerstone", re.compile(r"csod\.com")),
+    ("smartrecruiters", re.compile(r"smartrecruiters\.com")),
+    ("taleo", re.compile(r"taleo\.net")),
+    ("successfactors", re.compile(r"successfactors\.(com|eu)|sapsf\.")),
+    ("ashby", re.compile(r"ashbyhq\.com")),
+]
+
+# Requisition id extractors, tried in order against the final URL
+REQUISITION_PATTERNS = [
+    re.compile(r"_((?:JR|R|REQ)[-_]?\d+)(?:[/?#-]|$)", re.IGNORECASE),  # Workday
+    re.compile(r"/requisition/(\d+)"),  # Cornerstone
+    re.compile(r"/jobs/(\d+)"),  # Greenhouse, iCIMS
+    re.compile(r"/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})"),  # Lever, Ashby
+]
+
+# Query parameters carrying the requisition id (lower-cased), for boards that keep it out of the path
+REQUISITION_QUERY_PARAMS = ["job", "jobid", "career_job_req_id", "requisitionid"]  # Taleo, SuccessFactors and others
+
+CLOSED_STATUSES = {404, 410}
+
+# Matched against whole path segments and query parameters, so a requisition like /jobs/4041234 stays open
+CLOSED_PATH_PATTERN = re.compile(r"/(?:jobnotfound|job-not-found|notavailable|expired|404)(?:\.\w+)?(?=/|$)")
+CLOSED_QUERY_PATTERN = re.compile(r"(?:^|&)(?:error=true|expired(?:=[^&]*)?|jobnotfound(?:=[^&]*)?)(?=&|$)")
+
+CLOSED_TEXT_MARKERS = [
+    "no longer available",
+    "no longer accepting applications",
+    "job has expired",
+    "posting has expired",
+    "position has been filled",
+    "job is no longer open",
+    "this job has been closed",
+    "requisition is no longer active",
+    "page you are looking for doesn't exist",
+]
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive HTTP(S) connections, keyed by scheme and host."""
+
+    def __init__(self, timeout=10, max_per_host=4):
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self.ssl_context = ssl.create_default_context()
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def get(self, scheme, netloc):
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def put(self, scheme, netloc, conn):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if len(idle) < self.max_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+
+class PreflightResult:
+    """Outcome of checking a single job URL."""
+
+    def __init__(self, url):
+        self.url = url
+        self.final_url = url
+        self.status = None
+        self.ats = None
+        self.requisition = None
+        self.state = "open"  # open, closed, duplicate or error
+        self.reason = ""
+
+    def __repr__(self):
+        return f"PreflightResult({self.url!r}, state={self.state!r}, ats={self.ats!r}, status={self.status!r})"
+
+
+def _request(pool, url, max_body):
+    """Issue one GET on a pooled connection and return ``(status, location, body)``."""
+    parsed = urlparse(url)
+    scheme = parsed.scheme or "http"
+    path = parsed.path or "/"
+    if parsed.query:
+        path += "?" + parsed.query
+
+    headers = {
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,*/*;q=0.8",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    }
+
+    # A pooled connection may have been closed by the server; retry once on a fresh one
+    for attempt in range(2):
+        conn = pool.get(scheme, parsed.netloc)
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if attempt:
+                raise
+            continue
+        except Exception:
+            conn.close()
+            raise
+        break
+
+    body = response.read(max_body + 1)
+    if len(body) > max_body or response.will_close:
+        # Unread bytes would corrupt the next request on this connection
+        conn.close()
+        body = body[:max_body]
+    else:
+        pool.put(scheme, parsed.netloc, conn)
+
+    encoding = (response.getheader("Content-Encoding") or "").lower()
+    try:
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "deflate":
+            body = zlib.decompress(body)
+    except (OSError, EOFError, zlib.error):
+        # Truncated compressed body: fall back to whatever decodes
+        body = b""
+
+    return response.status, response.getheader("Location"), body.decode("utf-8", errors="replace")
+
+
+def detect_ats(url):
+    """Return the ATS vendor name for a URL, or None if unknown."""
+    target = url.lower()
+    for name, pattern in ATS_PATTERNS:
+        if pattern.search(target):
+            return name
+    return None
+
+
+def requisition_key(url):
+    """Key identifying the requisition behind a URL, used to spot duplicates."""
+    parsed = urlparse(url)
+    for pattern in REQUISITION_PATTERNS:
+        match = pattern.search(parsed.path)
+        if match:
+            return f"{parsed.netloc.lower()}:{match.group(1).upper()}"
+
+    query = parse_qsl(parsed.query)
+    params = {name.lower(): value for name, value in query}
+    for name in REQUISITION_QUERY_PARAMS:
+        if params.get(name):
+            return f"{parsed.netloc.lower()}:{name}={params[name].upper()}"
+
+    # Fall back to the canonical URL without fragment or apply suffix. The query is kept, sorted,
+    # so only the same posting listed twice collapses, never two IDs the patterns do not know.
+    path = re.sub(r"/apply(/.*)?$", "", parsed.path.rstrip("/"))
+    canonical = f"{parsed.netloc.lower()}{path}"
+    if query:
+        canonical += "?" + urlencode(sorted(query))
+    return canonical
+
+
+def check_url(pool, url, max_redirects=5, max_body=256 * 1024):
+    """Fetch a job URL, following redirects, and classify the posting."""
+    result = PreflightResult(url)
+    current = url
+
+    try:
+        for _ in range(max_redirects + 1):
+            status, location, body = _request(pool, current, max_body)
+            if status in REDIRECT_STATUSES and location:
+                current = urljoin(current, location)
+                continue
+            break
+        else:
+            result.state = "error"
+            result.reason = f"Too many redirects (>{max_redirects})"
+            return result
+    except Exception as e:
+        result.state = "error"
+        result.reason = f"{type(e).__name__}: {e}"
+        return result
+
+    result.final_url = current
+    result.status = status
+    result.ats = detect_ats(current) or detect_ats(url)
+    result.requisition = requisition_key(current)
+
+    final_parsed = urlparse(current.lower())
+    body_lower = body.lower()
+    if status in CLOSED_STATUSES:
+        result.state = "closed"
+        result.reason = f"HTTP {status}"
+    elif CLOSED_PATH_PATTERN.search(final_parsed.path) or CLOSED_QUERY_PATTERN.search(final_parsed.query):
+        result.state = "closed"
+        result.reason = f"Redirected to {current}"
+    else:
+        for marker in CLOSED_TEXT_MARKERS:
+            if marker in body_lower:
+                result.state = "closed"
+                result.reason = f"Page says '{marker}'"
+                break
+
+    if result.state == "open" and status >= 500:
+        result.state = "error"
+        result.reason = f"HTTP {status}"
+
+    return result
+
+
+def triage_urls(urls, workers=8, timeout=10, max_redirects=5):
+    """Check URLs concurrently and return one PreflightResult per URL, in input order.
+
+    Later URLs that resolve to a requisition already seen are marked as duplicates.
+    """
+    pool = ConnectionPool(timeout=timeout)
+    try:
+        with ThreadPoolExecutor(max_workers=max(int(workers), 1)) as executor:
+            results = list(executor.map(lambda url: check_url(pool, url, max_redirects), urls))
+    finally:
+        pool.close()
+
+    seen = {}
+    for result in results:
+        if result.state != "open":
+            continue
+        if result.requisition in seen:
+            result.state = "duplicate"
+            result.reason = f"Same requisition as {seen[result.requisition]}"
+        else:
+            seen[result.requisition] = result.url
+
+    return results
+
+
+def run_priority(result):
+    """0 for open known-ATS postings, 1 for open unknown ones, 2 for unreachable (lower runs first)."""
+    if result.state == "error":
+        return 2
+    return 0 if result.ats else 1
+
+
+def order_for_run(results):
+    """URLs worth opening in the browser: open known-ATS postings first, then unknown, then unreachable.
+
+    Closed and duplicate postings are dropped. Unreachable URLs are kept because
+    a failed pre-flight request does not mean the browser will fail too.
+    """
+    runnable = [r for r in results if r.state in ("open", "error")]
+    # sorted() is stable, so input order is kept within each rank
+    return [r.url for r in sorted(runnable, key=run_priority)]
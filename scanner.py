@@ -0,0 +1,238 @@
+# Page scanner across frames and shadow roots
+# One script per frame finds every field or button, including inside open shadow roots
+
+import logging
+
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+log = logging.getLogger(__name__)
+
+# Shared prelude: every open shadow root in this document, and every frame reachable from them
+ROOTS_PRELUDE = """
+const roots = [document];
+for (let r = 0; r < roots.length; r++) {
+    for (const node of roots[r].querySelectorAll("*")) {
+        if (node.shadowRoot) roots.push(node.shadowRoot);
+    }
+}
+const frames = [];
+for (const root of roots) {
+    for (const frame of root.querySelectorAll("iframe, frame")) frames.push(frame);
+}
+
+function queryAll(selector) {
+    const found = [];
+    for (const root of roots) {
+        for (const el of root.querySelectorAll(selector)) found.push(el);
+    }
+    return found;
+}
+
+function isVisible(el) {
+    const style = window.getComputedStyle(el);
+    const rect = el.getBoundingClientRect();
+    return style.display !== "none" && style.visibility !== "hidden" && (rect.width > 0 || rect.height > 0);
+}
+"""
+
+FRAMES_SCRIPT = ROOTS_PRELUDE + "return frames;"
+
+# Mirrors the XPath field query and the label lookups the fill loop used to make per element
+DESCRIBE_PRELUDE = """
+const FIELD_SELECTOR =
+    "input:not([type=hidden]):not([readonly]):not([disabled]), textarea:not([readonly]):not([disabled]), select:not([disabled])";
+
+function firstText(el) {
+    return el ? (el.innerText || "").trim() : "";
+}
+
+function describe(el) {
+    const root = el.getRootNode();
+    let label = "";
+    if (el.id) {
+        // Try label for attribute
+        label = firstText(root.querySelector(`label[for="${CSS.escape(el.id)}"]`));
+    }
+    // Try parent label
+    if (!label) label = firstText(el.closest("label"));
+    // Try sibling label
+    if (!label) label = firstText(el.previousElementSibling);
+    // Try parent element, first line only
+    if (!label) label = firstText(el.parentElement).split("\\n")[0].slice(0, 50);
+
+    let containerText = "";
+    // Generated IDs carry no meaning, so the surrounding container is used for matching
+    if (el.id && el.id.length > 20) {
+        const container = el.closest("div[class*=field], div[class*=form], div[class*=input]");
+        containerText = container ? firstText(container).toLowerCase().slice(0, 500) : "";
+    }
+
+    const automationHost = el.closest("[data-automation-id]");
+    const siblings = el.parentElement ? Array.from(el.parentElement.children).filter(c => c.tagName === el.tagName) : [el];
+
+    return {
+        element: el,
+        tag: el.tagName.toLowerCase(),
+        type: el.tagName === "SELECT" ? el.type : (el.getAttribute("type") || "text").toLowerCase(),
+        id: el.id || "",
+        name: el.getAttribute("name") || "",
+        placeholder: el.getAttribute("placeholder") || "",
+        aria_label: el.getAttribute("aria-label") || "",
+        title: el.getAttribute("title") || "",
+        value: el.value || "",
+        label: label,
+        container_text: containerText,
+        automation_id: automationHost ? automationHost.getAttribute("data-automation-id") : "",
+        sibling_index: siblings.indexOf(el),
+        visible: isVisible(el),
+        in_shadow: root !== document
+    };
+}
+"""
+
+FIELDS_SCRIPT = ROOTS_PRELUDE + DESCRIBE_PRELUDE + """
+return {items: queryAll(FIELD_SELECTOR).map(describe), frames: frames};
+"""
+
+# Finds the element in the current frame that best matches a field signature (arguments[0])
+LOCATE_SCRIPT = ROOTS_PRELUDE + DESCRIBE_PRELUDE + """
+const wanted = arguments[0];
+let best = null, bestScore = 0, tied = false;
+for (const el of queryAll(FIELD_SELECTOR)) {
+    if (el.tagName.toLowerCase() !== wanted.tag) continue;
+    const field = describe(el);
+    let score = 0;
+    if (wanted.automation_id && field.automation_id === wanted.automation_id) score += 4;
+    if (wanted.id && field.id === wanted.id) score += 4;
+    if (wanted.name && field.name === wanted.name) score += 3;
+    if (wanted.label && field.label === wanted.label) score += 2;
+    if (field.sibling_index === wanted.sibling_index) score += 1;
+    if (score > bestScore) {
+        best = el; bestScore = score; tied = false;
+    } else if (score === bestScore) {
+        tied = true;
+    }
+}
+// Position alone, or a tie, is not enough to be sure it is the same field
+return bestScore >= 3 && !tied ? best : null;
+"""
+
+BUTTONS_SCRIPT = ROOTS_PRELUDE + """
+const items = queryAll("button, input[type=submit]").map(el => ({
+    element: el,
+    text: (el.tagName === "INPUT" ? el.value : el.innerText || "").trim(),
+    tag: el.tagName.toLowerCase(),
+    type: (el.getAttribute("type") || "").toLowerCase(),
+    cls: (el.getAttribute("class") || "").toLowerCase(),
+    visible: isVisible(el),
+    enabled: !el.disabled
+}));
+return {items: items, frames: frames};
+"""
+
+
+def run_in_frames(driver, script, max_depth=3):
+    """Run a prelude-based ``script`` in the top document and every nested frame.
+
+    The script must return ``{items: [...], frames: [...]}``. Each item dict is
+    tagged with ``frame``, the tuple of frame indices leading to it (``()`` for
+    the top document). Leaves the driver in the top document.
+    """
+    collected = []
+
+    def walk(path):
+        result = driver.execute_script(script) or {}
+        for item in result.get("items", []):
+            item["frame"] = path
+            collected.append(item)
+
+        if len(path) >= max_depth:
+            return
+        for index, frame in enumerate(result.get("frames", [])):
+            try:
+                driver.switch_to.frame(frame)
+            except WebDriverException as e:
+                log.debug("Could not enter frame %s: %s", path + (index,), e)
+                continue
+            try:
+                walk(path + (index,))
+            except WebDriverException as e:
+                log.debug("Could not scan frame %s: %s", path + (index,), e)
+            finally:
+                driver.switch_to.parent_frame()
+
+    driver.switch_to.default_content()
+    try:
+        walk(())
+    finally:
+        driver.switch_to.default_content()
+    return collected
+
+
+def switch_to_frame_path(driver, path):
+    """Switch into the frame at ``path`` as returned by ``run_in_frames``. Returns False if it is gone."""
+    driver.switch_to.default_content()
+    for index in path:
+        frames = driver.execute_script(FRAMES_SCRIPT) or []
+        if index >= len(frames):
+            driver.switch_to.default_content()
+            return False
+        driver.switch_to.frame(frames[index])
+    return True
+
+
+def group_by_frame(items):
+    """``[(frame_path, [items...]), ...]`` in first-seen order, so each frame is entered once."""
+    groups = {}
+    for item in items:
+        groups.setdefault(item["frame"], []).append(item)
+    return list(groups.items())
+
+
+def scan_fields(driver, max_depth=3):
+    """All form fields in the page, its frames and open shadow roots, with labels resolved."""
+    return run_in_frames(driver, FIELDS_SCRIPT, max_depth)
+
+
+def scan_buttons(driver, max_depth=3):
+    """All buttons and submit inputs in the page, its frames and open shadow roots."""
+    return run_in_frames(driver, BUTTONS_SCRIPT, max_depth)
+
+
+def field_signature(field):
+    """Stable identity of a scanned field that survives a re-render."""
+    return {
+        "tag": field.get("tag", ""),
+        "automation_id": field.get("automation_id", ""),
+        "id": field.get("id", ""),
+        "name": field.get("name", ""),
+        "label": field.get("label", ""),
+        "sibling_index": field.get("sibling_index", -1),
+    }
+
+
+def relocate_field(driver, field):
+    """Find a re-rendered field again by its signature. Must be called inside the field's frame."""
+    try:
+        return driver.execute_script(LOCATE_SCRIPT, field_signature(field))
+    except WebDriverException as e:
+        log.debug("Could not re-locate field: %s", e)
+        return None
+
+
+def retry_stale(driver, field, action, attempts=2):
+    """Run ``action(element)``; on a stale element, re-locate just that field and try again.
+
+    The new element replaces ``field["element"]`` so later steps use it too.
+    """
+    for attempt in range(attempts + 1):
+        try:
+            return action(field["element"])
+        except StaleElementReferenceException:
+            if attempt == attempts:
+                raise
+            element = relocate_field(driver, field)
+            if element is None:
+                raise
+            log.debug("Re-located stale field '%s'", field.get("label") or field.get("name") or field.get("id"))
+            field["element"] = element
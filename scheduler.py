@@ -0,0 +1,141 @@
+# Per-host pacing for the application runner
+# Interleaves job URLs across hosts and rate-limits each host independently
+
+import logging
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urlparse
+
+log = logging.getLogger(__name__)
+
+
+class HostState:
+    """Token bucket and backoff state for a single host."""
+
+    def __init__(self, host, capacity, now):
+        self.host = host
+        self.queue = deque()
+        self.tokens = float(capacity)
+        self.last_refill = now
+        self.failures = 0
+        self.blocked_until = 0.0
+
+
+class HostScheduler:
+    """Hand out job URLs so no host is hit faster than its token bucket allows.
+
+    Each host gets a bucket holding up to ``burst`` tokens that refills at one
+    token every ``min_interval`` seconds. Failures put the host into
+    exponential backoff (``backoff_base`` doubled per consecutive failure, up to
+    ``backoff_max``); a success clears it. Of the hosts that are ready, the one
+    whose next URL has the lowest ``priority(url)`` is served, round-robin
+    between equal priorities, so the browser only waits when every host with
+    pending work is throttled.
+    """
+
+    def __init__(self, urls, min_interval=5, burst=1, backoff_base=30, backoff_max=600,
+                 clock=time.monotonic, sleep=time.sleep, priority=None):
+        self.min_interval = max(float(min_interval), 0.0)
+        self.burst = max(int(burst), 1)
+        self.backoff_base = float(backoff_base)
+        self.backoff_max = float(backoff_max)
+        self.clock = clock
+        self.sleep = sleep
+        self.priority = priority or (lambda url: 0)
+
+        now = clock()
+        self.hosts = OrderedDict()
+        # sorted() is stable, so each host's queue keeps input order within a priority
+        for url in sorted(urls, key=self.priority):
+            host = host_of(url)
+            if host not in self.hosts:
+                self.hosts[host] = HostState(host, self.burst, now)
+            self.hosts[host].queue.append(url)
+
+    def pending(self):
+        """Number of URLs not yet handed out."""
+        return sum(len(state.queue) for state in self.hosts.values())
+
+    def _refill(self, state, now):
+        if self.min_interval == 0:
+            state.tokens = float(self.burst)
+        else:
+            elapsed = now - state.last_refill
+            state.tokens = min(float(self.burst), state.tokens + elapsed / self.min_interval)
+        state.last_refill = now
+
+    def _wait_for(self, state, now):
+        """Seconds until ``state`` may be served again (0 if ready now)."""
+        wait = max(state.blocked_until - now, 0.0)
+        if state.tokens < 1:
+            wait = max(wait, (1 - state.tokens) * self.min_interval)
+        return wait
+
+    def next_ready(self):
+        """Return ``(url, 0)`` for a ready URL, or ``(None, wait)`` if all hosts are throttled.
+
+        Returns ``(None, 0)`` once every queue is empty.
+        """
+        now = self.clock()
+        shortest_wait = None
+        best = None
+
+        for host in list(self.hosts):
+            state = self.hosts[host]
+            if not state.queue:
+                continue
+
+            self._refill(state, now)
+            wait = self._wait_for(state, now)
+            if wait == 0:
+                # Strictly lower only: the first ready host in rotation wins ties
+                rank = self.priority(state.queue[0])
+                if best is None or rank < best[0]:
+                    best = (rank, state)
+                continue
+
+            if shortest_wait is None or wait < shortest_wait:
+                shortest_wait = wait
+
+        if best is not None:
+            state = best[1]
+            state.tokens -= 1
+            # Rotate so the next call starts with a different host
+            self.hosts.move_to_end(state.host)
+            return state.queue.popleft(), 0
+
+        return None, shortest_wait or 0
+
+    def acquire(self):
+        """Block until a URL may be processed and return it, or None when done."""
+        while True:
+            url, wait = self.next_ready()
+            if url is not None:
+                return url
+            if not self.pending():
+                return None
+            log.info("All hosts throttled, waiting %.1fs...", wait)
+            self.sleep(wait)
+
+    def record_success(self, url):
+        """Clear any backoff for the URL's host."""
+        state = self.hosts.get(host_of(url))
+        if state:
+            state.failures = 0
+            state.blocked_until = 0.0
+
+    def record_failure(self, url):
+        """Put the URL's host into exponential backoff and return the delay."""
+        state = self.hosts.get(host_of(url))
+        if not state:
+            return 0
+        state.failures += 1
+        delay = min(self.backoff_base * (2 ** (state.failures - 1)), self.backoff_max)
+        state.blocked_until = self.clock() + delay
+        log.warning("Backing off %s for %.0fs after %s failure(s)", state.host, delay, state.failures)
+        return delay
+
+
+def host_of(url):
+    """Host used as the pacing key for a job URL."""
+    return urlparse(url).netloc.lower() or url
@@ -0,0 +1,172 @@
+# Browser session supervision
+# Keeps long runs bounded by recycling Chrome on memory, count or crash
+
+import logging
+import os
+
+try:
+    import psutil
+except ImportError:  # Optional: falls back to /proc on Linux, count-only elsewhere
+    psutil = None
+
+log = logging.getLogger(__name__)
+
+# WebDriverException messages meaning the browser session itself is gone
+CRASH_MARKERS = [
+    "tab crashed",
+    "session deleted",
+    "invalid session id",
+    "chrome not reachable",
+    "disconnected",
+    "target window already closed",
+    "no such window",
+]
+
+
+def _proc_children_map():
+    """Map of pid -> child pids built from /proc (Linux only)."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after the closing paren
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def _proc_rss_bytes(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_rss(pid):
+    """Resident memory in bytes of ``pid`` and all its descendants, or None if unavailable."""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            total = 0
+            for proc in [root] + root.children(recursive=True):
+                try:
+                    total += proc.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return total
+        except psutil.Error:
+            return None
+
+    if not os.path.isdir("/proc"):
+        return None
+
+    children = _proc_children_map()
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += _proc_rss_bytes(current)
+        stack.extend(children.get(current, []))
+    return total
+
+
+class SessionSupervisor:
+    """Owns the WebDriver and replaces it when it grows too large or dies.
+
+    ``factory`` is called with no arguments to start a new driver. The driver is
+    recycled after ``max_applications`` applications, when the chromedriver
+    process tree exceeds ``max_rss_mb`` (if memory can be measured), or after a
+    WebDriverException that left the session unusable.
+    """
+
+    def __init__(self, factory, max_applications=25, max_rss_mb=1500):
+        self.factory = factory
+        self.max_applications = max_applications
+        self.max_rss_mb = max_rss_mb
+        self._driver = None
+        self.applications = 0
+        self.recycles = 0
+
+    @property
+    def driver(self):
+        """The current driver, started on first use."""
+        if self._driver is None:
+            self._driver = self.factory()
+            self.applications = 0
+        return self._driver
+
+    def rss_mb(self):
+        """Memory of the current browser process tree in MB, or None if unknown."""
+        if self._driver is None:
+            return None
+        try:
+            pid = self._driver.service.process.pid
+        except AttributeError:
+            return None
+        rss = process_tree_rss(pid)
+        return None if rss is None else rss / (1024 * 1024)
+
+    def is_alive(self):
+        """True if the current session still answers commands."""
+        if self._driver is None:
+            return False
+        try:
+            self._driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        if self._driver is None:
+            return
+        try:
+            self._driver.quit()
+        except Exception as e:
+            log.warning("Could not quit browser cleanly: %s", e)
+        self._driver = None
+
+    def recycle(self, reason):
+        """Quit the current browser; the next access to ``driver`` starts a fresh one."""
+        log.info("Recycling browser session (%s)", reason)
+        self.quit()
+        self.recycles += 1
+        self.applications = 0
+
+    def after_application(self):
+        """Count a finished application and recycle if the session died or a threshold was crossed."""
+        # Already recycled by handle_error
+        if self._driver is None:
+            return
+
+        # Form steps swallow WebDriver errors, so a crashed tab often only shows up here
+        if not self.is_alive():
+            self.recycle("session no longer responds")
+            return
+
+        self.applications += 1
+
+        if self.max_applications and self.applications >= self.max_applications:
+            self.recycle(f"{self.applications} applications")
+            return
+
+        if self.max_rss_mb:
+            rss = self.rss_mb()
+            if rss is not None and rss >= self.max_rss_mb:
+                self.recycle(f"browser memory {rss:.0f} MB >= {self.max_rss_mb} MB")
+
+    def handle_error(self, error):
+        """Recycle the browser if ``error`` left the session unusable. Returns True if recycled."""
+        message = str(error).lower()
+        if any(marker in message for marker in CRASH_MARKERS) or not self.is_alive():
+            self.recycle(f"crash: {str(error).splitlines()[0] if str(error) else type(error).__name__}")
+            return True
+        return False
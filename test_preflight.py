@@ -0,0 +1,128 @@
+# Pre-flight triage tests
+# Runs triage_urls against a local stand-in job board instead of real ATS hosts
+
+import gzip
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from preflight import triage_urls
+
+OPEN_PAGE = b"<html><h1>Software Engineer</h1><button>Apply</button></html>"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse can be observed
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        path = self.path
+
+        if path.startswith("/jobs/") or path.startswith("/jobdetail.ftl?"):
+            self.reply(200, OPEN_PAGE)
+        elif path == "/redirect-to-101":
+            self.reply(302, b"", [("Location", "/jobs/101")])
+        elif path == "/moved":
+            self.reply(302, b"", [("Location", "/404")])
+        elif path == "/404":
+            self.reply(200, b"<p>Oops</p>")
+        elif path == "/loop":
+            self.reply(302, b"", [("Location", "/loop")])
+        elif path == "/gone":
+            self.reply(404, b"not found")
+        elif path == "/removed":
+            self.reply(410, b"gone")
+        elif path == "/closed":
+            self.reply(200, b"<p>Sorry, this job is no longer available.</p>")
+        elif path == "/gzip":
+            self.reply(200, gzip.compress(b"<p>This position has been filled.</p>"), [("Content-Encoding", "gzip")])
+        elif path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in [b"<p>This job has ", b"expired</p>"]:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.reply(500, b"unexpected path")
+
+    def reply(self, status, body, headers=()):
+        # send_error would add "Connection: close"; every reply here stays keep-alive
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TriageTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.daemon_threads = True
+        self.server.connections = set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def triage(self, paths, **kwargs):
+        results = triage_urls([self.base + path for path in paths], **kwargs)
+        return {result.url[len(self.base):]: result for result in results}
+
+    def test_classifies_postings(self):
+        results = self.triage(
+            ["/jobs/101", "/redirect-to-101", "/jobs/4041234", "/moved", "/gone", "/removed", "/closed", "/gzip", "/chunked", "/loop"],
+            max_redirects=3,
+        )
+
+        self.assertEqual(results["/jobs/101"].state, "open")
+        self.assertEqual(results["/jobs/101"].status, 200)
+
+        self.assertEqual(results["/redirect-to-101"].state, "duplicate")
+        self.assertEqual(results["/redirect-to-101"].final_url, self.base + "/jobs/101")
+
+        # A requisition ID starting with 404 is not an error page
+        self.assertEqual(results["/jobs/4041234"].state, "open")
+        self.assertEqual(results["/moved"].state, "closed")
+        self.assertEqual(results["/moved"].reason, f"Redirected to {self.base}/404")
+
+        self.assertEqual((results["/gone"].state, results["/gone"].reason), ("closed", "HTTP 404"))
+        self.assertEqual((results["/removed"].state, results["/removed"].reason), ("closed", "HTTP 410"))
+
+        self.assertEqual(results["/closed"].state, "closed")
+        self.assertIn("no longer available", results["/closed"].reason)
+
+        self.assertEqual(results["/gzip"].state, "closed")
+        self.assertIn("position has been filled", results["/gzip"].reason)
+
+        self.assertEqual(results["/chunked"].state, "closed")
+        self.assertIn("job has expired", results["/chunked"].reason)
+
+        self.assertEqual(results["/loop"].state, "error")
+        self.assertIn("Too many redirects", results["/loop"].reason)
+
+    def test_requisition_in_query(self):
+        results = self.triage(["/jobdetail.ftl?job=12345", "/jobdetail.ftl?job=67890", "/jobdetail.ftl?lang=en&job=12345"])
+
+        # Different IDs in the query are different postings; the same ID again is a duplicate
+        self.assertEqual(results["/jobdetail.ftl?job=12345"].state, "open")
+        self.assertEqual(results["/jobdetail.ftl?job=67890"].state, "open")
+        self.assertEqual(results["/jobdetail.ftl?lang=en&job=12345"].state, "duplicate")
+
+    def test_reuses_connections(self):
+        paths = [f"/jobs/{n}" for n in range(24)]
+        results = self.triage(paths, workers=4)
+
+        self.assertTrue(all(result.state == "open" for result in results.values()))
+        # One keep-alive connection per worker at most, not one per URL
+        self.assertLessEqual(len(self.server.connections), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()